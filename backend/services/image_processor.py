@@ -5,13 +5,28 @@ Pure processing logic - NO AI prompts or UI code included.
 """
 
 import base64
+import hashlib
+import mmap
+import os
+import threading
 import cv2
 import numpy as np
 from PIL import Image
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
-from typing import Tuple, Optional, Dict
+from typing import Tuple, Optional, Dict, List, NamedTuple
 import mimetypes
+from utils.helpers import parse_image_header
+
+
+class ROI(NamedTuple):
+    """Region of interest cut from an image grid."""
+    index: int
+    position: Tuple[int, int]
+    size: Tuple[int, ...]
+    data: np.ndarray
 
 
 class ImageProcessor:
@@ -30,9 +45,54 @@ class ImageProcessor:
     MAX_FILE_SIZE_MB = 10
     MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
     
-    def __init__(self):
-        """Initialize image processor."""
+    # float32 scale factor so normalization never promotes to float64
+    _INV_255 = np.float32(1.0 / 255.0)
+    
+    # Encoder settings for save_processed_image, by file extension
+    SAVE_PARAMS = {
+        '.jpg': [cv2.IMWRITE_JPEG_QUALITY, 90],
+        '.jpeg': [cv2.IMWRITE_JPEG_QUALITY, 90],
+        '.png': [cv2.IMWRITE_PNG_COMPRESSION, 1]
+    }
+    
+    # ROI grid (row, col) cells in extraction order
+    ROI_GRID = 3
+    POSITIONS = (
+        (0, 0), (0, 1), (0, 2),
+        (1, 0), (1, 1), (1, 2),
+        (2, 0), (2, 1), (2, 2)
+    )
+    
+    # Metadata cache constraints
+    META_CACHE_SIZE = 128
+    HEADER_SNIFF_BYTES = 64 * 1024
+    
+    def __init__(self, paranoid_validation: bool = False):
+        """
+        Initialize image processor.
+        
+        Args:
+            paranoid_validation: Run PIL's full verify() during format
+                validation. Off by default: only the header is parsed and
+                corrupt pixel data surfaces as a decode error in
+                preprocess_image/process instead of up front.
+        """
+        self.paranoid_validation = paranoid_validation
         self.processed_images = {}
+        self._meta_cache = OrderedDict()
+        self._meta_lock = threading.Lock()
+        self._thread_local = threading.local()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+    
+    @property
+    def _clahe(self):
+        """CLAHE instance for the current thread (apply() is not thread-safe)."""
+        clahe = getattr(self._thread_local, 'clahe', None)
+        if clahe is None:
+            clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+            self._thread_local.clahe = clahe
+        return clahe
     
     def validate_image(self, image_file) -> dict:
         """
@@ -45,62 +105,23 @@ class ImageProcessor:
             Dictionary with validation results
         """
         try:
-            # Check file size first
-            if hasattr(image_file, 'seek') and hasattr(image_file, 'tell'):
-                image_file.seek(0, 2)  # Seek to end
-                file_size = image_file.tell()
-                image_file.seek(0)  # Reset
-                
-                if file_size > self.MAX_FILE_SIZE_BYTES:
-                    return {
-                        'valid': False,
-                        'error': f"File size exceeds {self.MAX_FILE_SIZE_MB}MB limit"
-                    }
-            
-            # Open image
-            if isinstance(image_file, str):
-                image = Image.open(image_file)
-            else:
-                image = Image.open(image_file.stream if hasattr(image_file, 'stream') else image_file)
-            
-            # Check MIME type if available
-            if hasattr(image_file, 'content_type'):
-                if image_file.content_type not in self.SUPPORTED_MIMETYPES:
-                    return {
-                        'valid': False,
-                        'error': f"Unsupported MIME type: {image_file.content_type}"
-                    }
-            
-            # Check format
-            if image.format not in self.ALLOWED_FORMATS:
-                return {
-                    'valid': False,
-                    'error': f"Invalid format. Allowed: {self.ALLOWED_FORMATS}"
-                }
-            
-            # Check size
-            width, height = image.size
-            if width < self.MIN_SIZE[0] or height < self.MIN_SIZE[1]:
-                return {
-                    'valid': False,
-                    'error': f"Image too small. Minimum: {self.MIN_SIZE}"
-                }
+            # Check MIME type and file size before reading the upload
+            error = self._check_upload(image_file, self._upload_size(image_file))
+            if error:
+                return {'valid': False, 'error': error}
             
-            if width > self.MAX_SIZE[0] or height > self.MAX_SIZE[1]:
-                return {
-                    'valid': False,
-                    'error': f"Image too large. Maximum: {self.MAX_SIZE}"
-                }
+            # Read header metadata (cached across methods)
+            meta = self._get_metadata(image_file)
             
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            error = self._check_image_meta(meta)
+            if error:
+                return {'valid': False, 'error': error}
             
             return {
                 'valid': True,
-                'format': image.format,
-                'size': (width, height),
-                'mode': image.mode
+                'format': meta['format'],
+                'size': meta['size'],
+                'mode': meta['mode']
             }
             
         except Exception as e:
@@ -109,10 +130,68 @@ class ImageProcessor:
                 'error': f"Image validation failed: {str(e)}"
             }
     
+    def _check_upload(self, image_file, file_size: int) -> Optional[str]:
+        """
+        Check the declared MIME type and the file size of an upload.
+        
+        Args:
+            image_file: File-like object or file path
+            file_size: Size of the file contents in bytes
+            
+        Returns:
+            Error message, or None if the upload passes
+        """
+        if hasattr(image_file, 'content_type'):
+            if image_file.content_type not in self.SUPPORTED_MIMETYPES:
+                return f"Unsupported MIME type: {image_file.content_type}"
+        
+        if file_size == 0:
+            return "File is empty"
+        
+        if file_size > self.MAX_FILE_SIZE_BYTES:
+            return f"File size exceeds {self.MAX_FILE_SIZE_MB}MB limit"
+        
+        return None
+    
+    def _check_image_meta(self, meta: Dict) -> Optional[str]:
+        """
+        Check image format and dimensions from header metadata.
+        
+        Args:
+            meta: Metadata from _extract_metadata
+            
+        Returns:
+            Error message, or None if the image passes
+        """
+        if meta['format'] not in self.ALLOWED_FORMATS:
+            return f"Invalid format. Allowed: {self.ALLOWED_FORMATS}"
+        
+        width, height = meta['size']
+        if width < self.MIN_SIZE[0] or height < self.MIN_SIZE[1]:
+            return f"Image too small. Minimum: {self.MIN_SIZE}"
+        
+        if width > self.MAX_SIZE[0] or height > self.MAX_SIZE[1]:
+            return f"Image too large. Maximum: {self.MAX_SIZE}"
+        
+        return None
+    
+    @staticmethod
+    def _upload_size(image_file) -> int:
+        """Size of a file path or upload in bytes, without reading it."""
+        if isinstance(image_file, (str, Path)):
+            return os.path.getsize(image_file)
+        
+        stream = image_file.stream if hasattr(image_file, 'stream') else image_file
+        stream.seek(0, 2)
+        file_size = stream.tell()
+        stream.seek(0)
+        return file_size
+    
     def validate_image_format(self, image_file) -> Tuple[bool, str]:
         """
         Validate image format and file type.
-        Checks: MIME type, file size, image integrity, format.
+        Checks: MIME type, file size, format, and image integrity when
+        paranoid_validation is enabled.
         
         Args:
             image_file: File-like object (from upload)
@@ -120,84 +199,202 @@ class ImageProcessor:
         Returns:
             Tuple of (is_valid: bool, message: str)
         """
+        is_valid, message, _ = self._validate_format_bytes(image_file)
+        return is_valid, message
+    
+    def _validate_format_bytes(self, image_file) -> Tuple[bool, str, Optional[bytes]]:
+        """
+        Validate image format, returning the raw bytes read along the way.
+        The upload is read once into memory so the integrity check and the
+        format check share one buffer instead of re-reading the stream.
+        
+        Args:
+            image_file: File-like object (from upload) or file path
+            
+        Returns:
+            Tuple of (is_valid: bool, message: str, raw bytes or None)
+        """
         try:
-            # Check file size
-            if hasattr(image_file, 'seek') and hasattr(image_file, 'tell'):
-                image_file.seek(0, 2)
-                file_size = image_file.tell()
-                image_file.seek(0)
-                
-                if file_size == 0:
-                    return False, "File is empty"
-                
-                if file_size > self.MAX_FILE_SIZE_BYTES:
-                    return False, f"File exceeds {self.MAX_FILE_SIZE_MB}MB limit"
+            # Check MIME type and file size before reading the upload
+            error = self._check_upload(image_file, self._upload_size(image_file))
+            if error:
+                return False, error, None
             
-            # Check MIME type
-            if hasattr(image_file, 'content_type'):
-                if image_file.content_type not in self.SUPPORTED_MIMETYPES:
-                    return False, f"Unsupported MIME type: {image_file.content_type}"
+            # Read file content once
+            image_data = self._read_bytes(image_file)
             
-            # Try to open and verify image
+            # Parse the header (full structural verify only in paranoid mode)
+            key = self._digest_bytes(image_data)
+            meta = self._meta_cache_get(key)
             try:
-                if hasattr(image_file, 'stream'):
-                    img = Image.open(image_file.stream)
-                else:
-                    image_file.seek(0)
-                    img = Image.open(image_file)
-                
-                img.verify()
-                image_file.seek(0)
-                
-                # Re-open for format check (verify closes the file)
-                if hasattr(image_file, 'stream'):
-                    img = Image.open(image_file.stream)
-                else:
-                    image_file.seek(0)
-                    img = Image.open(image_file)
-                
-                if img.format.upper() not in self.ALLOWED_FORMATS:
-                    return False, f"Unsupported image format: {img.format}"
+                if self.paranoid_validation:
+                    Image.open(self._open_buffer(image_data)).verify()
                 
-                image_file.seek(0)
-                return True, "Image format valid"
+                if meta is None:
+                    # Re-open from the in-memory buffer (verify invalidates the image)
+                    img = Image.open(self._open_buffer(image_data))
+                    meta = self._extract_metadata(img)
+                    self._meta_cache_put(key, meta)
                 
             except Exception as e:
-                return False, f"Invalid image file: {str(e)}"
+                return False, f"Invalid image file: {str(e)}", None
+            
+            if meta['format'].upper() not in self.ALLOWED_FORMATS:
+                return False, f"Unsupported image format: {meta['format']}", None
+            
+            return True, "Image format valid", image_data
             
         except Exception as e:
-            return False, f"Format validation error: {str(e)}"
+            return False, f"Format validation error: {str(e)}", None
+    
+    def _read_bytes(self, image_file):
+        """
+        Read the full contents of a file path or upload, rewinding streams.
+        File paths are memory-mapped read-only rather than copied into a
+        bytes object, so pages are only loaded as consumers touch them.
+        """
+        if isinstance(image_file, (str, Path)):
+            with open(image_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b''
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        stream = image_file.stream if hasattr(image_file, 'stream') else image_file
+        stream.seek(0)
+        image_data = stream.read()
+        stream.seek(0)
+        return image_data
+    
+    @staticmethod
+    def _open_buffer(image_data):
+        """Wrap raw image data in a seekable stream, reusing mmaps without copying."""
+        if isinstance(image_data, mmap.mmap):
+            image_data.seek(0)
+            return image_data
+        return BytesIO(image_data)
+    
+    def content_digest(self, image_file) -> bytes:
+        """
+        Hash the full contents of a file path or upload.
+        Every byte contributes, so equal digests mean identical images;
+        this is the key for the metadata cache.
+        
+        Args:
+            image_file: File-like object or file path
+            
+        Returns:
+            16-byte BLAKE2b digest
+        """
+        return self._digest_bytes(self._read_bytes(image_file))
+    
+    @staticmethod
+    def _digest_bytes(image_data) -> bytes:
+        """Hash in-memory image bytes (see content_digest)."""
+        return hashlib.blake2b(image_data, digest_size=16).digest()
+    
+    def _meta_cache_get(self, key: bytes) -> Optional[Dict]:
+        """Look up cached metadata, marking the entry as recently used."""
+        with self._meta_lock:
+            meta = self._meta_cache.get(key)
+            if meta is not None:
+                self._meta_cache.move_to_end(key)
+            return meta
+    
+    def _meta_cache_put(self, key: bytes, meta: Dict) -> None:
+        """Store metadata, evicting the least recently used entry when full."""
+        with self._meta_lock:
+            self._meta_cache[key] = meta
+            self._meta_cache.move_to_end(key)
+            if len(self._meta_cache) > self.META_CACHE_SIZE:
+                self._meta_cache.popitem(last=False)
+    
+    @staticmethod
+    def _extract_metadata(img: Image.Image) -> Dict:
+        """Collect header-level metadata from an opened PIL image."""
+        return {
+            'format': img.format,
+            'size': img.size,
+            'mode': img.mode,
+            'info': dict(img.info)
+        }
+    
+    def _get_metadata(self, image_file) -> Dict:
+        """
+        Get format, size, mode and info for an image.
+        Served from the metadata cache when the same content was seen before.
+        
+        Args:
+            image_file: File-like object or file path
+            
+        Returns:
+            Dictionary with format, size, mode and info
+        """
+        key = self.content_digest(image_file)
+        meta = self._meta_cache_get(key)
+        if meta is not None:
+            return meta
+        
+        if isinstance(image_file, (str, Path)):
+            img = Image.open(image_file)
+        else:
+            stream = image_file.stream if hasattr(image_file, 'stream') else image_file
+            stream.seek(0)
+            img = Image.open(stream)
+        
+        meta = self._extract_metadata(img)
+        
+        if hasattr(image_file, 'seek'):
+            image_file.seek(0)
+        
+        self._meta_cache_put(key, meta)
+        return meta
+    
+    def _get_dimensions(self, image_file) -> Tuple[int, int]:
+        """
+        Get image width and height from the file header alone.
+        Only the first HEADER_SNIFF_BYTES are read; falls back to PIL
+        metadata when the header is not recognised.
+        
+        Args:
+            image_file: File-like object or file path
+            
+        Returns:
+            Tuple of (width, height)
+        """
+        if isinstance(image_file, (str, Path)):
+            with open(image_file, 'rb') as f:
+                header = f.read(self.HEADER_SNIFF_BYTES)
+        else:
+            stream = image_file.stream if hasattr(image_file, 'stream') else image_file
+            stream.seek(0)
+            header = stream.read(self.HEADER_SNIFF_BYTES)
+            stream.seek(0)
+        
+        parsed = parse_image_header(header)
+        if parsed is not None:
+            return parsed[1], parsed[2]
+        
+        return self._get_metadata(image_file)['size']
     
     def encode_to_base64(self, image_file) -> Tuple[Optional[str], str]:
         """
         Encode image file to base64 string.
-        Validates before encoding.
+        Validates before encoding. File paths are memory-mapped and
+        encoded straight from the mapping. Only needed for data-URI/JSON
+        payloads; use to_binary when the consumer accepts raw bytes.
         
         Args:
-            image_file: File-like object (from upload)
+            image_file: File-like object (from upload) or file path
             
         Returns:
             Tuple of (base64_string or None, message: str)
         """
         try:
-            # Validate format first
-            is_valid, validation_msg = self.validate_image_format(image_file)
+            # Validate format first (reuses the bytes read during validation)
+            is_valid, validation_msg, image_data = self._validate_format_bytes(image_file)
             if not is_valid:
                 return None, f"Validation failed: {validation_msg}"
             
-            # Reset file pointer
-            if hasattr(image_file, 'seek'):
-                image_file.seek(0)
-            
-            # Read file content
-            if hasattr(image_file, 'stream'):
-                image_data = image_file.stream.read()
-            elif hasattr(image_file, 'read'):
-                image_data = image_file.read()
-            else:
-                with open(image_file, 'rb') as f:
-                    image_data = f.read()
-            
             # Encode to base64
             base64_string = base64.b64encode(image_data).decode('utf-8')
             
@@ -206,6 +403,29 @@ class ImageProcessor:
         except Exception as e:
             return None, f"Encoding error: {str(e)}"
     
+    def to_binary(self, image_file) -> Tuple[Optional[bytes], str]:
+        """
+        Return the raw image file bytes after validation.
+        Prefer this over encode_to_base64 for consumers that accept binary
+        uploads (multipart, SDK byte parts); base64 adds ~33% payload and an
+        extra encode pass, and is only required for data-URI/JSON embedding.
+        
+        Args:
+            image_file: File-like object (from upload) or file path
+            
+        Returns:
+            Tuple of (raw bytes or None, message: str)
+        """
+        try:
+            is_valid, validation_msg, image_data = self._validate_format_bytes(image_file)
+            if not is_valid:
+                return None, f"Validation failed: {validation_msg}"
+            
+            return bytes(image_data), "Image bytes ready for upload"
+            
+        except Exception as e:
+            return None, f"Read error: {str(e)}"
+    
     def preprocess_image(self, image_file) -> tuple:
         """
         Preprocess image for analysis.
@@ -214,65 +434,216 @@ class ImageProcessor:
             image_file: File-like object or file path
             
         Returns:
-            Tuple of (processed_array, original_image)
+            Tuple of (processed_array, original_image_array)
         """
         try:
-            # Open image
-            if isinstance(image_file, str):
-                image = Image.open(image_file)
-            else:
-                image = Image.open(image_file.stream)
+            # Decode straight to an ndarray
+            image_bgr = self._decode_to_bgr(image_file)
+            
+            # Resize to target size and normalize pixel values (0-1)
+            image_normalized = self._to_target_tensor(image_bgr)
             
-            # Ensure RGB
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            # Guarantee a C-contiguous tensor so downstream SIMD paths apply
+            return np.ascontiguousarray(image_normalized), cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
+            
+        except Exception as e:
+            raise Exception(f"Image preprocessing failed: {str(e)}")
+    
+    def preprocess_batch(self, image_files: list) -> np.ndarray:
+        """
+        Preprocess several images into one normalized batch tensor.
+        Resized uint8 frames are collected into a preallocated buffer and
+        normalized with a single vectorized pass over the whole batch.
+        
+        Args:
+            image_files: List of file-like objects or file paths
             
-            # Resize to target size
-            image_resized = image.resize(self.TARGET_SIZE, Image.Resampling.LANCZOS)
+        Returns:
+            float32 array of shape (N, height, width, 3) with values 0-1
+        """
+        try:
+            width, height = self.TARGET_SIZE
+            batch_uint8 = np.empty((len(image_files), height, width, 3), dtype=np.uint8)
             
-            # Convert to numpy array
-            image_array = np.array(image_resized, dtype=np.float32)
+            for i, image_file in enumerate(image_files):
+                self._resize_to_target(self._decode_to_bgr(image_file), dst=batch_uint8[i])
             
-            # Normalize pixel values (0-1)
-            image_normalized = image_array / 255.0
+            batch_normalized = np.empty(batch_uint8.shape, dtype=np.float32)
+            np.multiply(batch_uint8, self._INV_255, out=batch_normalized)
             
-            return image_normalized, image
+            return batch_normalized
             
         except Exception as e:
-            raise Exception(f"Image preprocessing failed: {str(e)}")
+            raise Exception(f"Batch preprocessing failed: {str(e)}")
+    
+    def process_batch(self, image_files: list) -> list:
+        """
+        Preprocess several images concurrently.
+        Decode, resize and normalization run in OpenCV/NumPy code that
+        releases the GIL, so a thread pool scales with core count.
+        
+        Args:
+            image_files: List of file-like objects or file paths
+            
+        Returns:
+            List of preprocess_image results, in input order
+        """
+        return list(self._get_pool().map(self.preprocess_image, image_files))
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Create the shared worker pool on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    thread_name_prefix='image-processor'
+                )
+            return self._pool
+    
+    def process(self, image_file, include_base64: bool = True) -> Dict:
+        """
+        Validate, encode and preprocess an image in a single pass.
+        The upload is read and decoded once, resized to TARGET_SIZE right
+        away, and the full-resolution pixels are released before returning.
+        
+        Args:
+            image_file: File-like object or file path
+            include_base64: Whether to base64-encode the raw file bytes
+            
+        Returns:
+            Dictionary with validation status, 'b64', 'tensor', 'info' and
+            'digest' (content_digest of the bytes read)
+        """
+        try:
+            # Check MIME type and file size before reading the upload
+            error = self._check_upload(image_file, self._upload_size(image_file))
+            if error:
+                return {'valid': False, 'error': error}
+            
+            # Read file content once
+            image_data = self._read_bytes(image_file)
+            
+            # Read header metadata (cached across methods)
+            key = self._digest_bytes(image_data)
+            meta = self._meta_cache_get(key)
+            if meta is None:
+                meta = self._extract_metadata(Image.open(self._open_buffer(image_data)))
+                self._meta_cache_put(key, meta)
+            
+            error = self._check_image_meta(meta)
+            if error:
+                return {'valid': False, 'error': error}
+            
+            # Decode, shrink immediately and drop the full-resolution buffer
+            full_image = self._decode_bytes_to_bgr(image_data)
+            original_size = (full_image.shape[1], full_image.shape[0])
+            tensor = self._to_target_tensor(full_image)
+            del full_image
+            
+            return {
+                'valid': True,
+                'b64': base64.b64encode(image_data).decode('utf-8') if include_base64 else None,
+                'tensor': tensor,
+                'digest': key,
+                'info': {
+                    'format': meta['format'],
+                    'size': meta['size'],
+                    'mode': meta['mode'],
+                    'original_size': original_size
+                }
+            }
+            
+        except Exception as e:
+            return {
+                'valid': False,
+                'error': f"Image processing failed: {str(e)}"
+            }
+    
+    def _resize_to_target(self, image_bgr: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Shrink a decoded BGR image to TARGET_SIZE and convert it to RGB.
+        The colour conversion runs on the small fixed-size frame instead of
+        the full-resolution image.
+        
+        Args:
+            image_bgr: uint8 BGR array of any size
+            dst: Optional preallocated (height, width, 3) uint8 output
+            
+        Returns:
+            uint8 RGB array of TARGET_SIZE
+        """
+        # INTER_AREA is the right kernel for downscaling
+        image_resized = cv2.resize(image_bgr, self.TARGET_SIZE, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(image_resized, cv2.COLOR_BGR2RGB, dst=dst)
+    
+    def _to_target_tensor(self, image_bgr: np.ndarray) -> np.ndarray:
+        """Resize a decoded BGR image to TARGET_SIZE as a 0-1 float32 RGB tensor."""
+        image_resized = self._resize_to_target(image_bgr)
+        
+        # Normalize in a single cast+scale pass
+        tensor = np.empty(image_resized.shape, dtype=np.float32)
+        np.multiply(image_resized, self._INV_255, out=tensor)
+        return tensor
+    
+    def _decode_to_bgr(self, image_file) -> np.ndarray:
+        """
+        Decode image bytes directly into a contiguous uint8 BGR array.
+        Falls back to PIL for formats OpenCV cannot decode (e.g. GIF).
+        
+        Args:
+            image_file: File-like object or file path
+            
+        Returns:
+            numpy array of shape (H, W, 3) in BGR order
+        """
+        return self._decode_bytes_to_bgr(self._read_bytes(image_file))
+    
+    def _decode_bytes_to_bgr(self, image_data) -> np.ndarray:
+        """Decode in-memory image bytes into a uint8 BGR array."""
+        image_bgr = cv2.imdecode(
+            np.frombuffer(image_data, dtype=np.uint8),
+            cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+        )
+        
+        if image_bgr is None:
+            image = Image.open(self._open_buffer(image_data)).convert('RGB')
+            image_bgr = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR)
+        
+        return image_bgr
     
     def enhance_image(self, image_array: np.ndarray) -> np.ndarray:
         """
         Enhance image for better disease detection.
         
         Args:
-            image_array: numpy array of image
+            image_array: numpy array of image (0-1 RGB), or a file-like
+                object / file path to decode directly
             
         Returns:
             Enhanced image array
         """
         try:
-            # Convert to 0-255 range for OpenCV
-            image_uint8 = (image_array * 255).astype(np.uint8)
-            
             # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)
-            lab = cv2.cvtColor(image_uint8, cv2.COLOR_RGB2LAB)
-            l, a, b = cv2.split(lab)
-            
-            clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-            l = clahe.apply(l)
-            
-            enhanced = cv2.merge([l, a, b])
-            enhanced = cv2.cvtColor(enhanced, cv2.COLOR_LAB2RGB)
+            # on the luma channel only; YCrCb is a cheap linear transform
+            if isinstance(image_array, np.ndarray):
+                # Convert to 0-255 range for OpenCV
+                image_uint8 = np.multiply(image_array, np.float32(255), dtype=np.float32).astype(np.uint8)
+                ycrcb = cv2.cvtColor(image_uint8, cv2.COLOR_RGB2YCrCb)
+            else:
+                ycrcb = cv2.cvtColor(self._decode_to_bgr(image_array), cv2.COLOR_BGR2YCrCb)
+            ycrcb[..., 0] = self._clahe.apply(ycrcb[..., 0])
+            enhanced = cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2RGB)
             
-            # Normalize back to 0-1
-            return enhanced.astype(np.float32) / 255.0
+            # Normalize back to 0-1 in a single cast+scale pass
+            enhanced_normalized = np.empty(enhanced.shape, dtype=np.float32)
+            np.multiply(enhanced, self._INV_255, out=enhanced_normalized)
+            return enhanced_normalized
             
         except Exception as e:
             print(f"Enhancement failed, returning original: {str(e)}")
             return image_array
     
-    def extract_roi(self, image_array: np.ndarray, focus_areas: int = 5) -> list:
+    def extract_roi(self, image_array: np.ndarray, focus_areas: int = 5) -> List[ROI]:
         """
         Extract regions of interest (ROI) from image.
         
@@ -281,40 +652,50 @@ class ImageProcessor:
             focus_areas: number of ROI areas to extract
             
         Returns:
-            List of ROI arrays
+            List of ROI tuples
         """
         try:
-            height, width = image_array.shape[:2]
-            rois = []
-            
-            # Define ROI grid
-            roi_height = height // 3
-            roi_width = width // 3
-            
-            positions = [
-                (0, 0), (0, roi_width), (0, 2*roi_width),
-                (roi_height, 0), (roi_height, roi_width),
-                (roi_height, 2*roi_width),
-                (2*roi_height, 0), (2*roi_height, roi_width),
-                (2*roi_height, 2*roi_width)
-            ]
+            blocks = self.extract_roi_blocks(image_array, focus_areas)
             
-            # Extract top N regions based on focus_areas
-            for i, (y, x) in enumerate(positions[:focus_areas]):
-                roi = image_array[y:y+roi_height, x:x+roi_width]
-                rois.append({
-                    'index': i,
-                    'position': (y, x),
-                    'size': roi.shape,
-                    'data': roi
-                })
+            # All ROIs share one shape, computed once per image
+            roi_size = blocks.shape[1:]
+            roi_height, roi_width = roi_size[:2]
             
-            return rois
+            return [
+                ROI(i, (row * roi_height, col * roi_width), roi_size, blocks[i])
+                for i, (row, col) in enumerate(self.POSITIONS[:len(blocks)])
+            ]
             
         except Exception as e:
             print(f"ROI extraction failed: {str(e)}")
             return []
     
+    def extract_roi_blocks(self, image_array: np.ndarray, focus_areas: int = 5) -> np.ndarray:
+        """
+        Extract regions of interest as a single batched array.
+        Tiles the image into a 3x3 grid in one reshape, ordered as POSITIONS.
+        
+        Args:
+            image_array: numpy array of image (H, W) or (H, W, C)
+            focus_areas: number of ROI areas to extract
+            
+        Returns:
+            Contiguous array of shape (focus_areas, roi_h, roi_w[, C])
+        """
+        grid = self.ROI_GRID
+        height, width = image_array.shape[:2]
+        channels = image_array.shape[2:]
+        roi_height = height // grid
+        roi_width = width // grid
+        
+        blocks = (
+            image_array[:grid * roi_height, :grid * roi_width]
+            .reshape(grid, roi_height, grid, roi_width, *channels)
+            .swapaxes(1, 2)
+            .reshape(grid * grid, roi_height, roi_width, *channels)
+        )
+        return np.ascontiguousarray(blocks[:focus_areas])
+    
     def save_processed_image(self, image_array: np.ndarray, filename: str, output_dir: str) -> str:
         """
         Save processed image to disk.
@@ -333,14 +714,21 @@ class ImageProcessor:
             
             # Convert to 0-255 if normalized
             if image_array.max() <= 1.0:
-                image_uint8 = (image_array * 255).astype(np.uint8)
+                image_uint8 = np.multiply(image_array, np.float32(255), dtype=np.float32).astype(np.uint8)
             else:
                 image_uint8 = image_array.astype(np.uint8)
             
-            # Save using PIL
-            image = Image.fromarray(image_uint8)
+            # OpenCV expects BGR(A) channel order
+            if image_uint8.ndim == 3 and image_uint8.shape[2] == 3:
+                image_uint8 = cv2.cvtColor(image_uint8, cv2.COLOR_RGB2BGR)
+            elif image_uint8.ndim == 3 and image_uint8.shape[2] == 4:
+                image_uint8 = cv2.cvtColor(image_uint8, cv2.COLOR_RGBA2BGRA)
+            
+            # Save using OpenCV (fast PNG compression level trades size for speed)
             file_path = output_path / filename
-            image.save(file_path)
+            save_params = self.SAVE_PARAMS.get(file_path.suffix.lower(), [])
+            if not cv2.imwrite(str(file_path), image_uint8, save_params):
+                raise Exception(f"Could not write {file_path}")
             
             return str(file_path)
             
@@ -358,17 +746,7 @@ class ImageProcessor:
             Tuple of (is_valid: bool, message: str)
         """
         try:
-            # Open image
-            if isinstance(image_file, str):
-                img = Image.open(image_file)
-            else:
-                if hasattr(image_file, 'stream'):
-                    img = Image.open(image_file.stream)
-                else:
-                    image_file.seek(0)
-                    img = Image.open(image_file)
-            
-            width, height = img.size
+            width, height = self._get_dimensions(image_file)
             
             # Check minimum dimensions
             if width < self.MIN_SIZE[0] or height < self.MIN_SIZE[1]:
@@ -378,9 +756,6 @@ class ImageProcessor:
             if width > self.MAX_SIZE[0] or height > self.MAX_SIZE[1]:
                 return False, f"Image too large. Max: {self.MAX_SIZE}, Got: ({width}, {height})"
             
-            if hasattr(image_file, 'seek'):
-                image_file.seek(0)
-            
             return True, f"Dimensions valid: ({width}, {height})"
             
         except Exception as e:
@@ -397,32 +772,20 @@ class ImageProcessor:
             Dictionary with image metadata
         """
         try:
-            # Open image
-            if isinstance(image_file, str):
-                img = Image.open(image_file)
-            else:
-                if hasattr(image_file, 'stream'):
-                    img = Image.open(image_file.stream)
-                else:
-                    image_file.seek(0)
-                    img = Image.open(image_file)
-            
-            width, height = img.size
+            meta = self._get_metadata(image_file)
+            width, height = meta['size']
             
             info = {
-                'format': img.format,
-                'mode': img.mode,
+                'format': meta['format'],
+                'mode': meta['mode'],
                 'size': (width, height),
                 'width': width,
                 'height': height,
                 'aspect_ratio': width / height if height > 0 else 0,
-                'has_alpha': img.mode in ('RGBA', 'LA', 'PA'),
-                'info': img.info if hasattr(img, 'info') else {}
+                'has_alpha': meta['mode'] in ('RGBA', 'LA', 'PA'),
+                'info': dict(meta['info'])
             }
             
-            if hasattr(image_file, 'seek'):
-                image_file.seek(0)
-            
             return info
             
         except Exception as e:
@@ -476,25 +839,10 @@ class ImageProcessor:
             Tuple of (numpy array or None, message: str)
         """
         try:
-            # Open and convert to RGB
-            if isinstance(image_file, str):
-                img = Image.open(image_file)
-            else:
-                if hasattr(image_file, 'stream'):
-                    img = Image.open(image_file.stream)
-                else:
-                    image_file.seek(0)
-                    img = Image.open(image_file)
-            
-            # Ensure RGB
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Convert to array
-            array = np.array(img, dtype=np.uint8)
-            
-            if hasattr(image_file, 'seek'):
-                image_file.seek(0)
+            # Decode and convert to RGB
+            array = np.ascontiguousarray(
+                cv2.cvtColor(self._decode_to_bgr(image_file), cv2.COLOR_BGR2RGB)
+            )
             
             return array, f"Converted to array with shape {array.shape}"
             
@@ -4,7 +4,443 @@ Interprets AI analysis and generates conditional suggestions.
 Pure IF-ELSE logic - NO API calls, NO UI code, NO authentication.
 """
 
-from typing import Dict, List, Optional
+from bisect import bisect_left
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Category bits produced by LogicEngine._scan_categories
+FUNGAL_BIT = 1 << 0
+BACTERIAL_BIT = 1 << 1
+VIRAL_BIT = 1 << 2
+ENVIRONMENTAL_BIT = 1 << 3
+DISEASE_BIT = 1 << 4
+WATER_BIT = 1 << 5
+NUTRIENT_BIT = 1 << 6
+PEST_BIT = 1 << 7
+HEALTHY_BIT = 1 << 8
+
+# Condition bits used by LogicEngine._evaluate_conditions. The fungal,
+# bacterial, viral, water and nutrient conditions share their category bits
+# so they can be copied straight out of the category mask.
+COND_FUNGAL = FUNGAL_BIT
+COND_BACTERIAL = BACTERIAL_BIT
+COND_VIRAL = VIRAL_BIT
+COND_WATER_STRESS = WATER_BIT
+COND_NUTRIENT_DEFICIENCY = NUTRIENT_BIT
+COND_LOW_CONFIDENCE = 1 << 9
+COND_AMBIGUOUS = 1 << 10
+COND_HIGH_CONFIDENCE = 1 << 11
+COND_CRITICAL_HEALTH = 1 << 12
+COND_POOR_HEALTH = 1 << 13
+COND_FAIR_HEALTH = 1 << 14
+COND_GOOD_HEALTH = 1 << 15
+COND_SEVERE = 1 << 16
+COND_MODERATE = 1 << 17
+COND_MILD = 1 << 18
+COND_EMERGENCY = 1 << 19
+COND_ENVIRONMENTAL_ONLY = 1 << 20
+COND_HEALTHY = 1 << 21
+
+# Health condition bits per follow-up tier (critical, poor, fair, above fair)
+_HEALTH_TIER_CONDITIONS = np.array((
+    COND_CRITICAL_HEALTH | COND_POOR_HEALTH | COND_FAIR_HEALTH,
+    COND_POOR_HEALTH | COND_FAIR_HEALTH,
+    COND_FAIR_HEALTH,
+    0
+), dtype=np.int64)
+
+# Severity codes, computed once per analysis from the severity string
+SEV_UNKNOWN = 0
+SEV_MILD = 1
+SEV_MODERATE = 2
+SEV_SEVERE = 3
+
+_SEV_CODES = {'mild': SEV_MILD, 'moderate': SEV_MODERATE, 'severe': SEV_SEVERE}
+
+# Condition bit for each severity code
+_SEVERITY_CONDITIONS = (0, COND_MILD, COND_MODERATE, COND_SEVERE)
+
+
+def _suggestion(suggestion_type: str, priority: str, action: str, details: tuple):
+    """Build one read-only suggestion template."""
+    return MappingProxyType({
+        'type': suggestion_type,
+        'priority': priority,
+        'action': action,
+        'details': details
+    })
+
+
+# Suggestion templates keyed by (category, severity code); None matches any
+# severity. Shared read-only - process_analysis copies them for callers.
+_SUGGESTION_TEMPLATES = {
+    ('FUNGAL', SEV_SEVERE): _suggestion(
+        'FUNGAL_DISEASE_TREATMENT',
+        'URGENT',
+        'Apply fungicide immediately',
+        (
+            'Use broad-spectrum fungicide (e.g., sulfur, copper)',
+            'Apply every 7-10 days until improvement',
+            'Remove affected leaves',
+            'Improve air circulation',
+            'Reduce leaf wetness (avoid overhead watering)'
+        )
+    ),
+    ('FUNGAL', SEV_MODERATE): _suggestion(
+        'FUNGAL_DISEASE_TREATMENT',
+        'HIGH',
+        'Treat fungal infection',
+        (
+            'Apply fungicide spray',
+            'Repeat treatment every 10-14 days',
+            'Remove moderately affected leaves',
+            'Improve air circulation and reduce humidity'
+        )
+    ),
+    ('FUNGAL', None): _suggestion(
+        'FUNGAL_DISEASE_TREATMENT',
+        'MEDIUM',
+        'Monitor and treat early fungal signs',
+        (
+            'Apply preventative fungicide',
+            'Remove affected leaves',
+            'Monitor closely for spread'
+        )
+    ),
+    ('BACTERIAL', SEV_SEVERE): _suggestion(
+        'BACTERIAL_DISEASE_TREATMENT',
+        'URGENT',
+        'Address bacterial infection urgently',
+        (
+            'Remove severely affected plant parts',
+            'Apply copper-based bactericide',
+            'Sterilize tools between cuts',
+            'Avoid watering foliage',
+            'Consider plant removal if severely infected'
+        )
+    ),
+    ('BACTERIAL', None): _suggestion(
+        'BACTERIAL_DISEASE_TREATMENT',
+        'HIGH',
+        'Treat bacterial infection',
+        (
+            'Apply copper spray',
+            'Remove infected plant material',
+            'Prevent wetting of leaves',
+            'Improve drainage'
+        )
+    ),
+    ('VIRAL', None): _suggestion(
+        'VIRAL_DISEASE_TREATMENT',
+        'URGENT',
+        'Manage viral infection',
+        (
+            'Remove entire affected plant (no cure for viruses)',
+            'Control insect vectors (aphids, whiteflies)',
+            'Disinfect tools to prevent spread',
+            'No chemical treatment available',
+            'Focus on prevention for other plants'
+        )
+    ),
+    ('DROUGHT', None): _suggestion(
+        'WATER_MANAGEMENT',
+        'HIGH',
+        'Address drought stress',
+        (
+            'Water deeply and thoroughly',
+            'Water less frequently but more thoroughly',
+            'Add mulch to retain moisture',
+            'Water during early morning or evening',
+            'Check soil moisture regularly (should be moist not wet)'
+        )
+    ),
+    ('OVERWATERING', None): _suggestion(
+        'WATER_MANAGEMENT',
+        'HIGH',
+        'Reduce watering',
+        (
+            'Allow soil to dry between waterings',
+            'Improve drainage (repot if needed)',
+            'Reduce watering frequency',
+            'Ensure pot has drainage holes',
+            'Check for root rot'
+        )
+    ),
+    ('NUTRIENT', None): _suggestion(
+        'NUTRIENT_MANAGEMENT',
+        'MEDIUM',
+        'Address nutrient deficiency',
+        (
+            'Apply balanced fertilizer (NPK 10-10-10)',
+            'Feed every 2-4 weeks during growing season',
+            'Use slow-release fertilizer',
+            'Consider foliar spray for quick recovery',
+            'Repot with fresh soil if last repotted >1 year ago'
+        )
+    ),
+    ('CLARIFICATION', None): _suggestion(
+        'DIAGNOSIS_CLARIFICATION',
+        'HIGH',
+        'Get professional confirmation',
+        (
+            'Diagnosis is uncertain',
+            'Consult local plant expert or extension service',
+            'Take multiple clear photos from different angles',
+            'Monitor plant closely for symptom development',
+            'Consider waiting to see symptom progression'
+        )
+    ),
+    ('ENVIRONMENTAL', None): _suggestion(
+        'ENVIRONMENTAL_ADJUSTMENT',
+        'MEDIUM',
+        'Improve growing conditions',
+        (
+            'Review light conditions (6-8 hours for most plants)',
+            'Check temperature (65-75°F optimal for most plants)',
+            'Monitor humidity (40-60% for most plants)',
+            'Ensure adequate air circulation',
+            'Avoid placing near heating/cooling vents'
+        )
+    ),
+    ('PEST_DAMAGE', None): _suggestion(
+        'PEST_MANAGEMENT',
+        'HIGH',
+        'Control pests',
+        (
+            'Inspect regularly for insect presence',
+            'Isolate plant to prevent spread',
+            'Use neem oil or insecticidal soap',
+            'Remove heavily infested leaves',
+            'Repeat treatment weekly until clear'
+        )
+    ),
+    ('HEALTHY', None): _suggestion(
+        'PREVENTATIVE_CARE',
+        'LOW',
+        'Maintain plant health',
+        (
+            'Continue regular watering schedule',
+            'Feed monthly during growing season',
+            'Monitor for early disease signs',
+            'Ensure good air circulation',
+            'Clean leaves monthly to improve photosynthesis'
+        )
+    )
+}
+
+_TREATMENT_CATEGORIES = ('FUNGAL', 'BACTERIAL', 'VIRAL')
+_ADJUSTMENT_CATEGORIES = ('ENVIRONMENTAL', 'PEST_DAMAGE')
+
+# Risk tables indexed by the integer codes computed in LogicEngine._assess_risk
+_HEALTH_RISK = (0, 25, 40)
+_HEALTH_RISK_FACTORS = (None, "Poor plant health", "Critical plant health")
+_SEVERITY_RISK = (0, 0, 15, 30)
+_SEVERITY_RISK_FACTORS = (None, None, "Moderate disease status", "Severe disease status")
+_DISEASE_RISK = (0, 15, 20)
+_DISEASE_RISK_FACTORS = (None, "Fungal disease (spreads quickly)", "Viral disease (incurable)")
+_RISK_LEVELS = ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+
+
+def _risk_kernel(health_code: int, severity_code: int, disease_code: int, spread: int) -> Tuple[int, int]:
+    """
+    Integer risk accumulator.
+    
+    Args:
+        health_code: 0 fair or better, 1 poor, 2 critical
+        severity_code: SEV_* severity code
+        disease_code: 0 other, 1 fungal, 2 viral
+        spread: 1 if spread risk applies, else 0
+    
+    Returns:
+        Tuple of (risk_score capped at 100, index into _RISK_LEVELS)
+    """
+    risk_score = min(
+        _HEALTH_RISK[health_code] + _SEVERITY_RISK[severity_code]
+        + _DISEASE_RISK[disease_code] + 5 * spread,
+        100
+    )
+    return risk_score, (risk_score >= 25) + (risk_score >= 50) + (risk_score >= 75)
+
+
+# Pre-baked outputs for the healthy fast path in LogicEngine.process_analysis
+_HEALTHY_CONDITIONS = ("GOOD_PLANT_HEALTH", "PLANT_APPEARS_HEALTHY")
+_HEALTHY_HIGH_CONFIDENCE_CONDITIONS = ("HIGH_CONFIDENCE_DIAGNOSIS",) + _HEALTHY_CONDITIONS
+_HEALTHY_SUGGESTIONS = (_SUGGESTION_TEMPLATES[('HEALTHY', None)],)
+_HEALTHY_RISK = MappingProxyType({
+    'risk_score': _risk_kernel(0, 0, 0, 1)[0],
+    'risk_level': _RISK_LEVELS[_risk_kernel(0, 0, 0, 1)[1]],
+    'risk_factors': ()
+})
+# Follow-up plans from critical to good health, indexed by health tier
+_FOLLOWUP_TABLE = (
+    # Critical: daily monitoring
+    MappingProxyType({
+        'schedule': 'DAILY',
+        'days': 1,
+        'duration_days': 7,
+        'reason': 'Plant is in critical condition'
+    }),
+    # Poor: every 2-3 days
+    MappingProxyType({
+        'schedule': 'EVERY_2_3_DAYS',
+        'days': 3,
+        'duration_days': 14,
+        'reason': 'Plant health is poor'
+    }),
+    # Fair: weekly
+    MappingProxyType({
+        'schedule': 'WEEKLY',
+        'days': 7,
+        'duration_days': 30,
+        'reason': 'Plant health is fair'
+    }),
+    # Good: every 2 weeks
+    MappingProxyType({
+        'schedule': 'BI_WEEKLY',
+        'days': 14,
+        'duration_days': 60,
+        'reason': 'Plant appears healthy'
+    })
+)
+_HEALTHY_FOLLOW_UP = _FOLLOWUP_TABLE[-1]
+
+# Emission order of detected conditions
+CONDITION_TABLE = (
+    (COND_LOW_CONFIDENCE, "LOW_CONFIDENCE_DIAGNOSIS"),
+    (COND_AMBIGUOUS, "AMBIGUOUS_DIAGNOSIS"),
+    (COND_HIGH_CONFIDENCE, "HIGH_CONFIDENCE_DIAGNOSIS"),
+    (COND_CRITICAL_HEALTH, "CRITICAL_PLANT_HEALTH"),
+    (COND_POOR_HEALTH, "POOR_PLANT_HEALTH"),
+    (COND_FAIR_HEALTH, "FAIR_PLANT_HEALTH"),
+    (COND_GOOD_HEALTH, "GOOD_PLANT_HEALTH"),
+    (COND_FUNGAL, "FUNGAL_DISEASE_DETECTED"),
+    (COND_BACTERIAL, "BACTERIAL_DISEASE_DETECTED"),
+    (COND_VIRAL, "VIRAL_DISEASE_DETECTED"),
+    (COND_WATER_STRESS, "WATER_STRESS_DETECTED"),
+    (COND_NUTRIENT_DEFICIENCY, "NUTRIENT_DEFICIENCY_DETECTED"),
+    (COND_SEVERE, "SEVERE_DISEASE"),
+    (COND_MODERATE, "MODERATE_DISEASE"),
+    (COND_MILD, "MILD_DISEASE"),
+    (COND_EMERGENCY, "EMERGENCY_INTERVENTION_NEEDED"),
+    (COND_ENVIRONMENTAL_ONLY, "ENVIRONMENTAL_STRESS_ONLY"),
+    (COND_HEALTHY, "PLANT_APPEARS_HEALTHY")
+)
+
+
+def _lower(text: str) -> str:
+    """Lowercase text, reusing it when it is already lowercase."""
+    return text if text.islower() else text.lower()
+
+
+# Every scanned keyword (all lowercase) mapped to the union of its category
+# bits. Single source of truth for the scan tables and category keyword lists.
+_KEYWORD_TO_MASK: Dict[str, int] = {
+    # Fungal diseases
+    'powdery mildew': FUNGAL_BIT,
+    'leaf spot': FUNGAL_BIT,
+    'rust': FUNGAL_BIT | DISEASE_BIT,
+    'blight': FUNGAL_BIT | DISEASE_BIT,
+    'anthracnose': FUNGAL_BIT,
+    'damping off': FUNGAL_BIT,
+    'root rot': FUNGAL_BIT,
+    'mildew': FUNGAL_BIT | DISEASE_BIT,
+
+    # Bacterial diseases
+    'bacterial leaf spot': BACTERIAL_BIT,
+    'bacterial blight': BACTERIAL_BIT,
+    'crown gall': BACTERIAL_BIT,
+    'bacterial wilt': BACTERIAL_BIT,
+    'fire blight': BACTERIAL_BIT,
+
+    # Viral diseases
+    'mosaic virus': VIRAL_BIT,
+    'leaf curl virus': VIRAL_BIT,
+    'viral infection': VIRAL_BIT,
+    'virus disease': VIRAL_BIT,
+
+    # Environmental stresses
+    'water stress': ENVIRONMENTAL_BIT,
+    'drought stress': ENVIRONMENTAL_BIT,
+    'overwatering': ENVIRONMENTAL_BIT,
+    'nutrient deficiency': ENVIRONMENTAL_BIT,
+    'nitrogen deficiency': ENVIRONMENTAL_BIT,
+    'phosphorus deficiency': ENVIRONMENTAL_BIT,
+    'potassium deficiency': ENVIRONMENTAL_BIT,
+    'chlorosis': ENVIRONMENTAL_BIT | NUTRIENT_BIT,
+    'yellowing': ENVIRONMENTAL_BIT | NUTRIENT_BIT,
+    'sunburn': ENVIRONMENTAL_BIT,
+    'cold damage': ENVIRONMENTAL_BIT,
+    'heat stress': ENVIRONMENTAL_BIT,
+
+    # Generic disease (not environmental) indicators
+    'disease': DISEASE_BIT,
+    'infection': DISEASE_BIT,
+    'fungal': DISEASE_BIT,
+    'bacterial': DISEASE_BIT,
+    'viral': DISEASE_BIT,
+    'spot': DISEASE_BIT,
+    'rot': DISEASE_BIT,
+
+    # Water stress indicators
+    'drought': WATER_BIT,
+    'water': WATER_BIT,
+    'dry': WATER_BIT,
+    'wilt': WATER_BIT,
+    'overwater': WATER_BIT,
+
+    # Nutrient deficiency indicators
+    'nutrient': NUTRIENT_BIT,
+    'nitrogen': NUTRIENT_BIT,
+    'phosphorus': NUTRIENT_BIT,
+    'potassium': NUTRIENT_BIT,
+    'deficiency': NUTRIENT_BIT,
+    'pale': NUTRIENT_BIT,
+
+    # Pest damage indicators
+    'pest': PEST_BIT,
+    'insect': PEST_BIT,
+
+    # Healthy plant indicators
+    'healthy': HEALTHY_BIT,
+    'no disease': HEALTHY_BIT
+}
+
+
+def _keywords_for(bit: int) -> Tuple[str, ...]:
+    """List the keywords that carry a category bit, in table order."""
+    return tuple(keyword for keyword, mask in _KEYWORD_TO_MASK.items() if mask & bit)
+
+
+# Category keyword lists
+_FUNGAL = _keywords_for(FUNGAL_BIT)
+_BACTERIAL = _keywords_for(BACTERIAL_BIT)
+_VIRAL = _keywords_for(VIRAL_BIT)
+_ENVIRONMENTAL = _keywords_for(ENVIRONMENTAL_BIT)
+_DISEASE_INDICATORS = _keywords_for(DISEASE_BIT)
+
+_KEYWORD_MASKS = tuple(_KEYWORD_TO_MASK.items())
+
+# Only water and nutrient indicators are matched against the raw AI text
+_TEXT_BITS = WATER_BIT | NUTRIENT_BIT
+_TEXT_KEYWORD_MASKS = tuple(
+    (keyword, mask & _TEXT_BITS)
+    for keyword, mask in _KEYWORD_TO_MASK.items()
+    if mask & _TEXT_BITS
+)
+
+# Disease category for the first matching category bit
+_CAT_PRIORITY = (
+    (FUNGAL_BIT, 'FUNGAL'),
+    (BACTERIAL_BIT, 'BACTERIAL'),
+    (VIRAL_BIT, 'VIRAL'),
+    (ENVIRONMENTAL_BIT, 'ENVIRONMENTAL'),
+    (PEST_BIT, 'PEST_DAMAGE'),
+    (HEALTHY_BIT, 'HEALTHY')
+)
 
 
 class LogicEngine:
@@ -14,47 +450,19 @@ class LogicEngine:
     Focus: Pure logic only - NO external calls, NO UI code.
     """
     
-    # Disease categories
-    FUNGAL_DISEASES = [
-        'powdery mildew',
-        'leaf spot',
-        'rust',
-        'blight',
-        'anthracnose',
-        'damping off',
-        'root rot',
-        'mildew'
-    ]
+    __slots__ = ('low_confidence_threshold', 'urgent_action_threshold', '_analysis_cache')
     
-    BACTERIAL_DISEASES = [
-        'bacterial leaf spot',
-        'bacterial blight',
-        'crown gall',
-        'bacterial wilt',
-        'fire blight'
-    ]
+    # Maximum number of memoized analyses per engine
+    ANALYSIS_CACHE_SIZE = 1024
     
-    VIRAL_DISEASES = [
-        'mosaic virus',
-        'leaf curl virus',
-        'viral infection',
-        'virus disease'
-    ]
+    # Disease categories
+    FUNGAL_DISEASES = _FUNGAL
+    BACTERIAL_DISEASES = _BACTERIAL
+    VIRAL_DISEASES = _VIRAL
+    ENVIRONMENTAL_STRESSES = _ENVIRONMENTAL
     
-    ENVIRONMENTAL_STRESSES = [
-        'water stress',
-        'drought stress',
-        'overwatering',
-        'nutrient deficiency',
-        'nitrogen deficiency',
-        'phosphorus deficiency',
-        'potassium deficiency',
-        'chlorosis',
-        'yellowing',
-        'sunburn',
-        'cold damage',
-        'heat stress'
-    ]
+    # Generic disease (not environmental) indicators
+    DISEASE_INDICATORS = _DISEASE_INDICATORS
     
     # Confidence thresholds
     HIGH_CONFIDENCE_THRESHOLD = 80.0
@@ -67,10 +475,21 @@ class LogicEngine:
     HEALTH_FAIR_THRESHOLD = 60.0
     HEALTH_GOOD_THRESHOLD = 80.0
     
+    # Upper bounds (inclusive) of the critical, poor and fair follow-up tiers
+    _FOLLOWUP_THRESHOLDS = (
+        HEALTH_CRITICAL_THRESHOLD, HEALTH_POOR_THRESHOLD, HEALTH_FAIR_THRESHOLD
+    )
+    
     def __init__(self):
         """Initialize Logic Engine with default parameters."""
         self.low_confidence_threshold = self.MEDIUM_CONFIDENCE_THRESHOLD
         self.urgent_action_threshold = self.HEALTH_CRITICAL_THRESHOLD
+        
+        # Per-instance memo so the cache dies with the engine. Typed so 80
+        # and 80.0 keep separate entries and echo back unchanged.
+        self._analysis_cache = lru_cache(
+            maxsize=self.ANALYSIS_CACHE_SIZE, typed=True
+        )(self._process_analysis_cached)
     
     def process_analysis(self, ai_analysis: Dict) -> Dict:
         """
@@ -86,177 +505,302 @@ class LogicEngine:
             return self._create_error_response("Empty analysis")
         
         # Extract key metrics
-        diagnosis = ai_analysis.get('diagnosis', '').lower()
-        confidence = ai_analysis.get('confidence', 0.0)
-        health_score = ai_analysis.get('health_score', 50.0)
-        severity = ai_analysis.get('severity', 'unknown').lower()
-        raw_analysis = ai_analysis.get('raw_analysis', '')
-        
-        # Initialize result
-        result = {
-            'original_analysis': diagnosis,
-            'confidence': confidence,
-            'health_score': health_score,
-            'severity': severity,
-            'conditions': [],
-            'suggestions': [],
-            'urgent_actions': [],
-            'disease_category': None,
-            'risk_assessment': None,
-            'follow_up': None
-        }
-        
-        # Apply conditional logic
-        result['conditions'] = self._evaluate_conditions(
-            diagnosis, confidence, health_score, severity, raw_analysis
+        result = self._analysis_cache(
+            ai_analysis.get('diagnosis', ''),
+            ai_analysis.get('confidence', 0.0),
+            ai_analysis.get('health_score', 50.0),
+            ai_analysis.get('severity', 'unknown'),
+            ai_analysis.get('raw_analysis', ''),
+            self.low_confidence_threshold
         )
         
-        result['disease_category'] = self._classify_disease(diagnosis)
-        result['suggestions'] = self._generate_suggestions(
-            diagnosis, confidence, health_score, severity, result['disease_category']
-        )
-        result['urgent_actions'] = self._generate_urgent_actions(
-            health_score, severity, result['disease_category']
-        )
-        result['risk_assessment'] = self._assess_risk(
-            diagnosis, health_score, severity
-        )
-        result['follow_up'] = self._determine_followup(confidence, health_score)
+        # Hand out a private copy so callers cannot mutate the cached result
+        return self._copy_result(result)
+    
+    def process_analyses(self, ai_analyses: List[Dict]) -> List[Dict]:
+        """
+        Process a batch of AI analyses.
+        Numeric threshold conditions are evaluated for the whole batch at once.
+        
+        Args:
+            ai_analyses: List of AI analysis dictionaries
+        
+        Returns:
+            List of processed analyses, in input order
+        """
+        results: List[Optional[Dict]] = [None] * len(ai_analyses)
+        batch = []
+        for index, ai_analysis in enumerate(ai_analyses):
+            if ai_analysis:
+                batch.append((index, ai_analysis))
+            else:
+                results[index] = self._create_error_response("Empty analysis")
+        
+        if batch:
+            confidence = np.fromiter(
+                (ai_analysis.get('confidence', 0.0) for _, ai_analysis in batch),
+                dtype=np.float64, count=len(batch)
+            )
+            health = np.fromiter(
+                (ai_analysis.get('health_score', 50.0) for _, ai_analysis in batch),
+                dtype=np.float64, count=len(batch)
+            )
+            threshold_flags = self._threshold_flags_batch(confidence, health).tolist()
+            
+            for (index, ai_analysis), flags in zip(batch, threshold_flags):
+                results[index] = self._copy_result(self._analyze(
+                    ai_analysis.get('diagnosis', ''),
+                    ai_analysis.get('confidence', 0.0),
+                    ai_analysis.get('health_score', 50.0),
+                    ai_analysis.get('severity', 'unknown'),
+                    ai_analysis.get('raw_analysis', ''),
+                    flags
+                ))
+        
+        return results
+    
+    def _process_analysis_cached(
+        self,
+        diagnosis: str,
+        confidence: float,
+        health_score: float,
+        severity: str,
+        raw_analysis: str,
+        low_confidence_threshold: float
+    ) -> Dict:
+        """
+        Core of process_analysis, memoized per engine by _analysis_cache.
+        Repeat submissions of the same analysis skip all rule evaluation.
+        
+        Args:
+            low_confidence_threshold: Current threshold; only part of the
+                cache key, so changing it never serves stale results
         
-        return result
+        Returns:
+            Shared result dictionary; never return it to callers uncopied
+        """
+        return self._analyze(
+            diagnosis, confidence, health_score, severity, raw_analysis,
+            self._threshold_flags(confidence, health_score)
+        )
     
-    def _evaluate_conditions(
+    def _analyze(
         self,
         diagnosis: str,
         confidence: float,
         health_score: float,
         severity: str,
-        raw_analysis: str
-    ) -> List[str]:
+        raw_analysis: str,
+        threshold_flags: int
+    ) -> Dict:
         """
-        Evaluate conditions based on analysis metrics.
+        Run every rule for one analysis.
         
         Args:
             diagnosis: Diagnosed condition
             confidence: Confidence percentage (0-100)
             health_score: Health score (0-100)
-            severity: Disease severity (mild, moderate, severe)
+            severity: Disease severity
             raw_analysis: Raw AI analysis text
+            threshold_flags: Numeric COND_* flags from _threshold_flags
         
         Returns:
-            List of detected conditions
+            Result dictionary that may share read-only parts with templates
         """
-        conditions = []
-        
-        # CONDITION 1: Low confidence detection
-        if confidence < self.low_confidence_threshold:
-            conditions.append("LOW_CONFIDENCE_DIAGNOSIS")
+        diagnosis = _lower(diagnosis)
+        severity = _lower(severity)
+        severity_code = _SEV_CODES.get(severity, SEV_UNKNOWN)
+        
+        # Scan keywords once and share the category bitmask. Water and
+        # nutrient indicators also match anywhere in the raw AI text.
+        category_mask = self._scan_categories(diagnosis) | self._scan_categories(
+            _lower(raw_analysis), _TEXT_KEYWORD_MASKS
+        )
         
-        # CONDITION 2: Very low confidence (ambiguous diagnosis)
-        if confidence < self.MEDIUM_CONFIDENCE_THRESHOLD:
-            conditions.append("AMBIGUOUS_DIAGNOSIS")
+        # Apply conditional logic
+        disease_category = self._classify_disease(category_mask)
+        
+        # Healthy fast path: no keywords beyond healthy ones, good health,
+        # confident, no severity
+        if (
+            not category_mask & ~HEALTHY_BIT
+            and threshold_flags & COND_HEALTHY
+            and not severity_code
+        ):
+            return self._healthy_result(
+                diagnosis, confidence, health_score, severity, disease_category
+            )
+        
+        condition_flags = self._evaluate_conditions(
+            diagnosis, threshold_flags, severity_code, category_mask
+        )
         
-        # CONDITION 3: High confidence
+        return {
+            'original_analysis': diagnosis,
+            'confidence': confidence,
+            'health_score': health_score,
+            'severity': severity,
+            'conditions': [name for bit, name in CONDITION_TABLE if condition_flags & bit],
+            'suggestions': self._generate_suggestions(
+                diagnosis, confidence, health_score, severity_code, disease_category,
+                condition_flags
+            ),
+            'urgent_actions': self._generate_urgent_actions(
+                health_score, severity_code, disease_category
+            ),
+            'disease_category': disease_category,
+            'risk_assessment': self._assess_risk(
+                diagnosis, health_score, severity_code, category_mask
+            ),
+            'follow_up': self._determine_followup(confidence, health_score)
+        }
+    
+    def _healthy_result(
+        self,
+        diagnosis: str,
+        confidence: float,
+        health_score: float,
+        severity: str,
+        disease_category: str
+    ) -> Dict:
+        """
+        Assemble the result for a keyword-free, healthy, confident analysis.
+        Equivalent to the full rule evaluation for that input class.
+        """
         if confidence >= self.HIGH_CONFIDENCE_THRESHOLD:
-            conditions.append("HIGH_CONFIDENCE_DIAGNOSIS")
-        
-        # CONDITION 4: Critical health status
-        if health_score <= self.HEALTH_CRITICAL_THRESHOLD:
-            conditions.append("CRITICAL_PLANT_HEALTH")
-        
-        # CONDITION 5: Poor health status
-        if health_score <= self.HEALTH_POOR_THRESHOLD:
-            conditions.append("POOR_PLANT_HEALTH")
-        
-        # CONDITION 6: Fair health status
-        if health_score <= self.HEALTH_FAIR_THRESHOLD:
-            conditions.append("FAIR_PLANT_HEALTH")
-        
-        # CONDITION 7: Good health status
-        if health_score >= self.HEALTH_GOOD_THRESHOLD:
-            conditions.append("GOOD_PLANT_HEALTH")
-        
-        # CONDITION 8: Fungal disease detected
-        if self._is_fungal_disease(diagnosis):
-            conditions.append("FUNGAL_DISEASE_DETECTED")
-        
-        # CONDITION 9: Bacterial disease detected
-        if self._is_bacterial_disease(diagnosis):
-            conditions.append("BACTERIAL_DISEASE_DETECTED")
-        
-        # CONDITION 10: Viral disease detected
-        if self._is_viral_disease(diagnosis):
-            conditions.append("VIRAL_DISEASE_DETECTED")
+            conditions = _HEALTHY_HIGH_CONFIDENCE_CONDITIONS
+        else:
+            conditions = _HEALTHY_CONDITIONS
         
-        # CONDITION 11: Water stress detected
-        if self._is_water_stress(diagnosis, raw_analysis):
-            conditions.append("WATER_STRESS_DETECTED")
+        return {
+            'original_analysis': diagnosis,
+            'confidence': confidence,
+            'health_score': health_score,
+            'severity': severity,
+            'conditions': conditions,
+            'suggestions': _HEALTHY_SUGGESTIONS,
+            'urgent_actions': (),
+            'disease_category': disease_category,
+            'risk_assessment': _HEALTHY_RISK,
+            'follow_up': _HEALTHY_FOLLOW_UP
+        }
+    
+    @staticmethod
+    def _copy_result(result: Dict) -> Dict:
+        """Copy a processed analysis down to its nested lists and dicts."""
+        risk_assessment = result['risk_assessment']
+        return {
+            **result,
+            'conditions': list(result['conditions']),
+            'suggestions': [
+                {**suggestion, 'details': list(suggestion['details'])}
+                for suggestion in result['suggestions']
+            ],
+            'urgent_actions': list(result['urgent_actions']),
+            'risk_assessment': {
+                **risk_assessment,
+                'risk_factors': list(risk_assessment['risk_factors'])
+            },
+            'follow_up': dict(result['follow_up'])
+        }
+    
+    def _threshold_flags(self, confidence: float, health_score: float) -> int:
+        """
+        Evaluate the purely numeric conditions.
         
-        # CONDITION 12: Nutrient deficiency detected
-        if self._is_nutrient_deficiency(diagnosis, raw_analysis):
-            conditions.append("NUTRIENT_DEFICIENCY_DETECTED")
+        Args:
+            confidence: Confidence percentage (0-100)
+            health_score: Health score (0-100)
         
-        # CONDITION 13: Severe disease
-        if severity == 'severe':
-            conditions.append("SEVERE_DISEASE")
+        Returns:
+            Bitmask of confidence and health COND_* flags
+        """
+        # Threshold tests fold into the flags as 0/1 multiples of their bit
+        return (
+            (confidence < self.low_confidence_threshold) * COND_LOW_CONFIDENCE
+            | (confidence < self.MEDIUM_CONFIDENCE_THRESHOLD) * COND_AMBIGUOUS
+            | (confidence >= self.HIGH_CONFIDENCE_THRESHOLD) * COND_HIGH_CONFIDENCE
+            | (health_score <= self.HEALTH_CRITICAL_THRESHOLD) * COND_CRITICAL_HEALTH
+            | (health_score <= self.HEALTH_POOR_THRESHOLD) * COND_POOR_HEALTH
+            | (health_score <= self.HEALTH_FAIR_THRESHOLD) * COND_FAIR_HEALTH
+            | (health_score >= self.HEALTH_GOOD_THRESHOLD) * COND_GOOD_HEALTH
+            | (
+                health_score >= self.HEALTH_GOOD_THRESHOLD
+                and confidence >= self.MEDIUM_CONFIDENCE_THRESHOLD
+            ) * COND_HEALTHY
+        )
+    
+    def _threshold_flags_batch(self, confidence: np.ndarray, health: np.ndarray) -> np.ndarray:
+        """
+        Vectorized _threshold_flags over arrays of confidence and health scores.
         
-        # CONDITION 14: Moderate disease
-        if severity == 'moderate':
-            conditions.append("MODERATE_DISEASE")
+        Args:
+            confidence: Confidence percentages
+            health: Health scores
         
-        # CONDITION 15: Mild disease
-        if severity == 'mild':
-            conditions.append("MILD_DISEASE")
+        Returns:
+            int64 array of confidence and health COND_* flags
+        """
+        health_tier = np.digitize(health, self._FOLLOWUP_THRESHOLDS, right=True)
+        good = health >= self.HEALTH_GOOD_THRESHOLD
+        return (
+            (confidence < self.low_confidence_threshold) * COND_LOW_CONFIDENCE
+            | (confidence < self.MEDIUM_CONFIDENCE_THRESHOLD) * COND_AMBIGUOUS
+            | (confidence >= self.HIGH_CONFIDENCE_THRESHOLD) * COND_HIGH_CONFIDENCE
+            | _HEALTH_TIER_CONDITIONS[health_tier]
+            | good * COND_GOOD_HEALTH
+            | (good & (confidence >= self.MEDIUM_CONFIDENCE_THRESHOLD)) * COND_HEALTHY
+        )
+    
+    def _evaluate_conditions(
+        self,
+        diagnosis: str,
+        threshold_flags: int,
+        severity_code: int,
+        category_mask: int
+    ) -> int:
+        """
+        Evaluate conditions based on analysis metrics.
         
-        # CONDITION 16: Emergency intervention needed
-        if health_score <= self.HEALTH_CRITICAL_THRESHOLD and severity == 'severe':
-            conditions.append("EMERGENCY_INTERVENTION_NEEDED")
+        Args:
+            diagnosis: Diagnosed condition (lowercased)
+            threshold_flags: Numeric COND_* flags from _threshold_flags
+            severity_code: SEV_* severity code
+            category_mask: Category bits scanned from diagnosis and raw AI text
         
-        # CONDITION 17: Environmental stress (non-disease)
-        if self._is_environmental_stress(diagnosis) and not self._is_disease(diagnosis):
-            conditions.append("ENVIRONMENTAL_STRESS_ONLY")
+        Returns:
+            Bitmask of detected COND_* flags; names come from CONDITION_TABLE
+        """
+        flags = (
+            threshold_flags
+            | category_mask & (
+                COND_FUNGAL | COND_BACTERIAL | COND_VIRAL
+                | COND_WATER_STRESS | COND_NUTRIENT_DEFICIENCY
+            )
+            | _SEVERITY_CONDITIONS[severity_code]
+        )
         
-        # CONDITION 18: Healthy plant
-        if health_score >= self.HEALTH_GOOD_THRESHOLD and confidence >= self.MEDIUM_CONFIDENCE_THRESHOLD:
-            conditions.append("PLANT_APPEARS_HEALTHY")
+        # Compound conditions
+        if flags & COND_CRITICAL_HEALTH and flags & COND_SEVERE:
+            flags |= COND_EMERGENCY
+        if category_mask & (ENVIRONMENTAL_BIT | DISEASE_BIT) == ENVIRONMENTAL_BIT:
+            flags |= COND_ENVIRONMENTAL_ONLY
         
-        return conditions
+        return flags
     
-    def _classify_disease(self, diagnosis: str) -> Optional[str]:
+    def _classify_disease(self, category_mask: int) -> Optional[str]:
         """
         Classify disease into category.
         
         Args:
-            diagnosis: Disease diagnosis text
+            category_mask: Category bits from _scan_categories(diagnosis)
         
         Returns:
             Disease category or None
         """
-        diagnosis_lower = diagnosis.lower()
-        
-        # Check fungal
-        if self._is_fungal_disease(diagnosis_lower):
-            return 'FUNGAL'
-        
-        # Check bacterial
-        if self._is_bacterial_disease(diagnosis_lower):
-            return 'BACTERIAL'
-        
-        # Check viral
-        if self._is_viral_disease(diagnosis_lower):
-            return 'VIRAL'
-        
-        # Check environmental
-        if self._is_environmental_stress(diagnosis_lower):
-            return 'ENVIRONMENTAL'
-        
-        # Check pest damage
-        if 'pest' in diagnosis_lower or 'insect' in diagnosis_lower:
-            return 'PEST_DAMAGE'
-        
-        # Unknown/healthy
-        if 'healthy' in diagnosis_lower or 'no disease' in diagnosis_lower:
-            return 'HEALTHY'
+        for bit, category in _CAT_PRIORITY:
+            if category_mask & bit:
+                return category
         
         return 'UNKNOWN'
     
@@ -265,220 +809,63 @@ class LogicEngine:
         diagnosis: str,
         confidence: float,
         health_score: float,
-        severity: str,
-        disease_category: Optional[str]
+        severity_code: int,
+        disease_category: Optional[str],
+        condition_flags: int
     ) -> List[Dict]:
         """
         Generate actionable suggestions based on analysis.
         
         Args:
-            diagnosis: Disease diagnosis
+            diagnosis: Disease diagnosis (lowercased)
             confidence: Confidence percentage
             health_score: Plant health score
-            severity: Disease severity
+            severity_code: SEV_* severity code
             disease_category: Classified disease category
+            condition_flags: Condition bitmask from _evaluate_conditions
         
         Returns:
             List of suggestion dictionaries
         """
+        templates = _SUGGESTION_TEMPLATES
         suggestions = []
         
-        # SUGGESTION 1: Fungal disease treatment
-        if disease_category == 'FUNGAL':
-            if severity == 'severe':
-                suggestions.append({
-                    'type': 'FUNGAL_DISEASE_TREATMENT',
-                    'priority': 'URGENT',
-                    'action': 'Apply fungicide immediately',
-                    'details': [
-                        'Use broad-spectrum fungicide (e.g., sulfur, copper)',
-                        'Apply every 7-10 days until improvement',
-                        'Remove affected leaves',
-                        'Improve air circulation',
-                        'Reduce leaf wetness (avoid overhead watering)'
-                    ]
-                })
-            elif severity == 'moderate':
-                suggestions.append({
-                    'type': 'FUNGAL_DISEASE_TREATMENT',
-                    'priority': 'HIGH',
-                    'action': 'Treat fungal infection',
-                    'details': [
-                        'Apply fungicide spray',
-                        'Repeat treatment every 10-14 days',
-                        'Remove moderately affected leaves',
-                        'Improve air circulation and reduce humidity'
-                    ]
-                })
-            else:  # mild
-                suggestions.append({
-                    'type': 'FUNGAL_DISEASE_TREATMENT',
-                    'priority': 'MEDIUM',
-                    'action': 'Monitor and treat early fungal signs',
-                    'details': [
-                        'Apply preventative fungicide',
-                        'Remove affected leaves',
-                        'Monitor closely for spread'
-                    ]
-                })
-        
-        # SUGGESTION 2: Bacterial disease treatment
-        if disease_category == 'BACTERIAL':
-            if severity == 'severe':
-                suggestions.append({
-                    'type': 'BACTERIAL_DISEASE_TREATMENT',
-                    'priority': 'URGENT',
-                    'action': 'Address bacterial infection urgently',
-                    'details': [
-                        'Remove severely affected plant parts',
-                        'Apply copper-based bactericide',
-                        'Sterilize tools between cuts',
-                        'Avoid watering foliage',
-                        'Consider plant removal if severely infected'
-                    ]
-                })
+        # Disease treatment, specific to severity where a template exists
+        if disease_category in _TREATMENT_CATEGORIES:
+            suggestions.append(
+                templates.get((disease_category, severity_code))
+                or templates[(disease_category, None)]
+            )
+        
+        # Water stress: drought vs overwatering
+        if condition_flags & COND_WATER_STRESS:
+            if 'drought' in diagnosis or 'dry' in diagnosis:
+                suggestions.append(templates[('DROUGHT', None)])
             else:
-                suggestions.append({
-                    'type': 'BACTERIAL_DISEASE_TREATMENT',
-                    'priority': 'HIGH',
-                    'action': 'Treat bacterial infection',
-                    'details': [
-                        'Apply copper spray',
-                        'Remove infected plant material',
-                        'Prevent wetting of leaves',
-                        'Improve drainage'
-                    ]
-                })
-        
-        # SUGGESTION 3: Viral disease treatment
-        if disease_category == 'VIRAL':
-            suggestions.append({
-                'type': 'VIRAL_DISEASE_TREATMENT',
-                'priority': 'URGENT',
-                'action': 'Manage viral infection',
-                'details': [
-                    'Remove entire affected plant (no cure for viruses)',
-                    'Control insect vectors (aphids, whiteflies)',
-                    'Disinfect tools to prevent spread',
-                    'No chemical treatment available',
-                    'Focus on prevention for other plants'
-                ]
-            })
-        
-        # SUGGESTION 4: Water stress
-        if 'WATER_STRESS_DETECTED' in [c for c in self._evaluate_conditions(
-            diagnosis, confidence, health_score, severity, diagnosis
-        )]:
-            if 'drought' in diagnosis.lower() or 'dry' in diagnosis.lower():
-                suggestions.append({
-                    'type': 'WATER_MANAGEMENT',
-                    'priority': 'HIGH',
-                    'action': 'Address drought stress',
-                    'details': [
-                        'Water deeply and thoroughly',
-                        'Water less frequently but more thoroughly',
-                        'Add mulch to retain moisture',
-                        'Water during early morning or evening',
-                        'Check soil moisture regularly (should be moist not wet)'
-                    ]
-                })
-            else:  # overwatering
-                suggestions.append({
-                    'type': 'WATER_MANAGEMENT',
-                    'priority': 'HIGH',
-                    'action': 'Reduce watering',
-                    'details': [
-                        'Allow soil to dry between waterings',
-                        'Improve drainage (repot if needed)',
-                        'Reduce watering frequency',
-                        'Ensure pot has drainage holes',
-                        'Check for root rot'
-                    ]
-                })
-        
-        # SUGGESTION 5: Nutrient deficiency
-        if 'NUTRIENT_DEFICIENCY_DETECTED' in [c for c in self._evaluate_conditions(
-            diagnosis, confidence, health_score, severity, diagnosis
-        )]:
-            suggestions.append({
-                'type': 'NUTRIENT_MANAGEMENT',
-                'priority': 'MEDIUM',
-                'action': 'Address nutrient deficiency',
-                'details': [
-                    'Apply balanced fertilizer (NPK 10-10-10)',
-                    'Feed every 2-4 weeks during growing season',
-                    'Use slow-release fertilizer',
-                    'Consider foliar spray for quick recovery',
-                    'Repot with fresh soil if last repotted >1 year ago'
-                ]
-            })
-        
-        # SUGGESTION 6: Low confidence diagnosis
+                suggestions.append(templates[('OVERWATERING', None)])
+        
+        # Nutrient deficiency
+        if condition_flags & COND_NUTRIENT_DEFICIENCY:
+            suggestions.append(templates[('NUTRIENT', None)])
+        
+        # Low confidence diagnosis
         if confidence < self.MEDIUM_CONFIDENCE_THRESHOLD:
-            suggestions.append({
-                'type': 'DIAGNOSIS_CLARIFICATION',
-                'priority': 'HIGH',
-                'action': 'Get professional confirmation',
-                'details': [
-                    'Diagnosis is uncertain',
-                    'Consult local plant expert or extension service',
-                    'Take multiple clear photos from different angles',
-                    'Monitor plant closely for symptom development',
-                    'Consider waiting to see symptom progression'
-                ]
-            })
-        
-        # SUGGESTION 7: Environmental stress
-        if disease_category == 'ENVIRONMENTAL':
-            suggestions.append({
-                'type': 'ENVIRONMENTAL_ADJUSTMENT',
-                'priority': 'MEDIUM',
-                'action': 'Improve growing conditions',
-                'details': [
-                    'Review light conditions (6-8 hours for most plants)',
-                    'Check temperature (65-75°F optimal for most plants)',
-                    'Monitor humidity (40-60% for most plants)',
-                    'Ensure adequate air circulation',
-                    'Avoid placing near heating/cooling vents'
-                ]
-            })
-        
-        # SUGGESTION 8: Pest damage
-        if disease_category == 'PEST_DAMAGE':
-            suggestions.append({
-                'type': 'PEST_MANAGEMENT',
-                'priority': 'HIGH',
-                'action': 'Control pests',
-                'details': [
-                    'Inspect regularly for insect presence',
-                    'Isolate plant to prevent spread',
-                    'Use neem oil or insecticidal soap',
-                    'Remove heavily infested leaves',
-                    'Repeat treatment weekly until clear'
-                ]
-            })
-        
-        # SUGGESTION 9: Preventative maintenance
+            suggestions.append(templates[('CLARIFICATION', None)])
+        
+        # Environmental stress or pest damage
+        if disease_category in _ADJUSTMENT_CATEGORIES:
+            suggestions.append(templates[(disease_category, None)])
+        
+        # Preventative maintenance
         if health_score >= self.HEALTH_GOOD_THRESHOLD or disease_category == 'HEALTHY':
-            suggestions.append({
-                'type': 'PREVENTATIVE_CARE',
-                'priority': 'LOW',
-                'action': 'Maintain plant health',
-                'details': [
-                    'Continue regular watering schedule',
-                    'Feed monthly during growing season',
-                    'Monitor for early disease signs',
-                    'Ensure good air circulation',
-                    'Clean leaves monthly to improve photosynthesis'
-                ]
-            })
+            suggestions.append(templates[('HEALTHY', None)])
         
         return suggestions
     
     def _generate_urgent_actions(
         self,
         health_score: float,
-        severity: str,
+        severity_code: int,
         disease_category: Optional[str]
     ) -> List[str]:
         """
@@ -486,7 +873,7 @@ class LogicEngine:
         
         Args:
             health_score: Plant health score
-            severity: Disease severity
+            severity_code: SEV_* severity code
             disease_category: Disease category
         
         Returns:
@@ -499,11 +886,11 @@ class LogicEngine:
             urgent_actions.append("ISOLATE PLANT: Prevent disease spread to other plants")
         
         # URGENT ACTION 2: Severe disease
-        if severity == 'severe':
+        if severity_code == SEV_SEVERE:
             urgent_actions.append("TREAT IMMEDIATELY: Disease is advancing rapidly")
         
         # URGENT ACTION 3: Fungal + severe
-        if disease_category == 'FUNGAL' and severity == 'severe':
+        if disease_category == 'FUNGAL' and severity_code == SEV_SEVERE:
             urgent_actions.append("APPLY FUNGICIDE: Fungal diseases spread quickly")
         
         # URGENT ACTION 4: Viral disease
@@ -515,7 +902,7 @@ class LogicEngine:
             urgent_actions.append("CHANGE CONDITIONS: Environmental stress is critical")
         
         # URGENT ACTION 6: Pest infestation
-        if disease_category == 'PEST_DAMAGE' and severity == 'severe':
+        if disease_category == 'PEST_DAMAGE' and severity_code == SEV_SEVERE:
             urgent_actions.append("ISOLATE AND TREAT: Pest infestation is severe")
         
         return urgent_actions
@@ -524,67 +911,55 @@ class LogicEngine:
         self,
         diagnosis: str,
         health_score: float,
-        severity: str
+        severity_code: int,
+        category_mask: int
     ) -> Dict:
         """
         Assess plant risk factors.
         
         Args:
-            diagnosis: Disease diagnosis
+            diagnosis: Disease diagnosis (lowercased)
             health_score: Plant health score
-            severity: Disease severity
+            severity_code: SEV_* severity code
+            category_mask: Category bits from _scan_categories(diagnosis)
         
         Returns:
             Risk assessment dictionary
         """
-        risk_score = 0  # 0-100, higher = riskier
-        risk_factors = []
-        
         # Factor 1: Low health score
         if health_score <= self.HEALTH_CRITICAL_THRESHOLD:
-            risk_score += 40
-            risk_factors.append("Critical plant health")
+            health_code = 2
         elif health_score <= self.HEALTH_POOR_THRESHOLD:
-            risk_score += 25
-            risk_factors.append("Poor plant health")
-        
-        # Factor 2: Disease severity
-        if severity == 'severe':
-            risk_score += 30
-            risk_factors.append("Severe disease status")
-        elif severity == 'moderate':
-            risk_score += 15
-            risk_factors.append("Moderate disease status")
-        
-        # Factor 3: Disease type
-        if self._is_viral_disease(diagnosis):
-            risk_score += 20
-            risk_factors.append("Viral disease (incurable)")
-        elif self._is_fungal_disease(diagnosis):
-            risk_score += 15
-            risk_factors.append("Fungal disease (spreads quickly)")
-        
-        # Factor 4: Spread risk
-        if 'ENVIRONMENTAL_STRESS' not in diagnosis.lower():
-            # Diseases spread more than environmental stress
-            risk_score += 5
-        
-        # Cap risk score at 100
-        risk_score = min(risk_score, 100)
-        
-        # Determine risk level
-        if risk_score >= 75:
-            risk_level = 'CRITICAL'
-        elif risk_score >= 50:
-            risk_level = 'HIGH'
-        elif risk_score >= 25:
-            risk_level = 'MEDIUM'
+            health_code = 1
+        else:
+            health_code = 0
+        
+        # Factor 2: Disease severity arrives as severity_code
+        
+        # Factor 3: Disease type (viral outranks fungal)
+        if category_mask & VIRAL_BIT:
+            disease_code = 2
+        elif category_mask & FUNGAL_BIT:
+            disease_code = 1
         else:
-            risk_level = 'LOW'
+            disease_code = 0
+        
+        # Factor 4: Spread risk - diseases spread more than environmental stress
+        spread = int('ENVIRONMENTAL_STRESS' not in diagnosis)
+        
+        risk_score, level_code = _risk_kernel(health_code, severity_code, disease_code, spread)
+        
+        risk_factors = [
+            factor for factor in (
+                _HEALTH_RISK_FACTORS[health_code],
+                _SEVERITY_RISK_FACTORS[severity_code],
+                _DISEASE_RISK_FACTORS[disease_code]
+            ) if factor
+        ]
         
         return {
             'risk_score': risk_score,
-            'risk_level': risk_level,
+            'risk_level': _RISK_LEVELS[level_code],
             'risk_factors': risk_factors
         }
     
@@ -601,79 +976,34 @@ class LogicEngine:
             health_score: Plant health score
         
         Returns:
-            Follow-up plan dictionary
+            Follow-up plan (shared, read-only)
         """
-        if health_score <= self.HEALTH_CRITICAL_THRESHOLD:
-            # Critical: daily monitoring
-            return {
-                'schedule': 'DAILY',
-                'days': 1,
-                'duration_days': 7,
-                'reason': 'Plant is in critical condition'
-            }
-        elif health_score <= self.HEALTH_POOR_THRESHOLD:
-            # Poor: every 2-3 days
-            return {
-                'schedule': 'EVERY_2_3_DAYS',
-                'days': 3,
-                'duration_days': 14,
-                'reason': 'Plant health is poor'
-            }
-        elif health_score <= self.HEALTH_FAIR_THRESHOLD:
-            # Fair: weekly
-            return {
-                'schedule': 'WEEKLY',
-                'days': 7,
-                'duration_days': 30,
-                'reason': 'Plant health is fair'
-            }
-        else:
-            # Good: every 2 weeks
-            return {
-                'schedule': 'BI_WEEKLY',
-                'days': 14,
-                'duration_days': 60,
-                'reason': 'Plant appears healthy'
-            }
-    
-    def _is_fungal_disease(self, text: str) -> bool:
-        """Check if text indicates fungal disease."""
-        return any(disease in text.lower() for disease in self.FUNGAL_DISEASES)
-    
-    def _is_bacterial_disease(self, text: str) -> bool:
-        """Check if text indicates bacterial disease."""
-        return any(disease in text.lower() for disease in self.BACTERIAL_DISEASES)
+        # Scores that fail every comparison (NaN) get the good-health plan,
+        # as with a plain if/elif chain
+        if not health_score <= self.HEALTH_FAIR_THRESHOLD:
+            return _FOLLOWUP_TABLE[-1]
+        return _FOLLOWUP_TABLE[bisect_left(self._FOLLOWUP_THRESHOLDS, health_score)]
     
-    def _is_viral_disease(self, text: str) -> bool:
-        """Check if text indicates viral disease."""
-        return any(disease in text.lower() for disease in self.VIRAL_DISEASES)
-    
-    def _is_water_stress(self, diagnosis: str, raw_analysis: str = "") -> bool:
-        """Check if water stress is indicated."""
-        text = (diagnosis + " " + raw_analysis).lower()
-        water_indicators = ['drought', 'water', 'dry', 'wilt', 'overwater']
-        return any(indicator in text for indicator in water_indicators)
-    
-    def _is_nutrient_deficiency(self, diagnosis: str, raw_analysis: str = "") -> bool:
-        """Check if nutrient deficiency is indicated."""
-        text = (diagnosis + " " + raw_analysis).lower()
-        nutrient_indicators = [
-            'nutrient', 'nitrogen', 'phosphorus', 'potassium',
-            'deficiency', 'chlorosis', 'yellowing', 'pale'
-        ]
-        return any(indicator in text for indicator in nutrient_indicators)
-    
-    def _is_environmental_stress(self, text: str) -> bool:
-        """Check if environmental stress is indicated."""
-        return any(stress in text.lower() for stress in self.ENVIRONMENTAL_STRESSES)
-    
-    def _is_disease(self, text: str) -> bool:
-        """Check if disease (not environmental) is indicated."""
-        disease_indicators = [
-            'disease', 'infection', 'fungal', 'bacterial', 'viral',
-            'blight', 'rust', 'mildew', 'spot', 'rot'
-        ]
-        return any(indicator in text.lower() for indicator in disease_indicators)
+    def _scan_categories(
+        self,
+        text_lower: str,
+        keyword_masks: Tuple[Tuple[str, int], ...] = _KEYWORD_MASKS
+    ) -> int:
+        """
+        Scan lowercased text once against every category keyword.
+        
+        Args:
+            text_lower: Lowercased text to scan
+            keyword_masks: (keyword, mask) table to match against
+        
+        Returns:
+            Bitmask of matched category bits
+        """
+        category_mask = 0
+        for keyword, mask in keyword_masks:
+            if keyword in text_lower:
+                category_mask |= mask
+        return category_mask
     
     def _create_error_response(self, error_message: str) -> Dict:
         """Create standardized error response."""
@@ -3,9 +3,25 @@ Plant analysis service.
 Integrates image processing and disease detection for comprehensive plant analysis.
 """
 
-from typing import Optional, Dict, List
+import copy
+import os
+from bisect import bisect_left
+import threading
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple
 from models import PlantDiseaseDetector
-from .image_processor import ImageProcessor
+from .image_processor import ImageProcessor, ROI
+
+
+# Severity tiers: a metric strictly above the i-th cut reaches tier i + 1
+_SEV_LABELS = ('mild', 'moderate', 'severe')
+_PROG_LABELS = ('early_stage', 'progressing', 'advancing')
+_SEV_DAMAGE_CUTS = (0.3, 0.6)
+_SEV_AREA_CUTS = (0.4, 0.7)
 
 
 class PlantAnalyzer:
@@ -14,11 +30,36 @@ class PlantAnalyzer:
     Combines image processing with disease detection.
     """
     
+    # Pixel standard deviation above which an ROI counts as affected
+    ROI_AFFECTED_STD = 15
+    
+    # Maximum number of memoized analysis results
+    ANALYSIS_CACHE_SIZE = 256
+    
     def __init__(self):
-        """Initialize plant analyzer with required services."""
-        self.image_processor = ImageProcessor()
-        self.disease_detector = PlantDiseaseDetector()
-        self.analysis_cache = {}
+        """Initialize plant analyzer; services are created on first use."""
+        self._services_lock = threading.Lock()
+        self.analysis_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+    
+    @cached_property
+    def image_processor(self) -> ImageProcessor:
+        """Image processor, created on first access."""
+        return self._get_service('image_processor', ImageProcessor)
+    
+    @cached_property
+    def disease_detector(self) -> PlantDiseaseDetector:
+        """Disease detection model, loaded on first access."""
+        return self._get_service('disease_detector', PlantDiseaseDetector)
+    
+    def _get_service(self, name: str, factory):
+        """Build a service once even when threads race on first access."""
+        with self._services_lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = factory()
+            return self.__dict__[name]
     
     def analyze_plant_image(self, image_file, confidence_threshold: float = 0.7) -> Dict:
         """
@@ -32,23 +73,31 @@ class PlantAnalyzer:
             Dictionary with complete analysis results
         """
         try:
-            # Step 1: Validate image
-            validation = self.image_processor.validate_image(image_file)
-            if not validation['valid']:
+            # Step 1-2: Validate and preprocess image in one pass
+            processed = self.image_processor.process(image_file, include_base64=False)
+            if not processed['valid']:
                 return {
                     'success': False,
-                    'error': validation['error'],
+                    'error': processed['error'],
                     'stage': 'validation'
                 }
             
-            # Step 2: Preprocess image
-            image_array, original_image = self.image_processor.preprocess_image(image_file)
+            # Identical images analyzed at the same threshold reuse the result
+            cache_key = (processed['digest'], confidence_threshold)
+            cached = self._analysis_cache_get(cache_key)
+            if cached is not None:
+                cached['timestamp'] = self._get_timestamp()
+                return cached
+            
+            image_array = processed['tensor']
+            image_info = processed['info']
             
             # Step 3: Enhance image
             enhanced_image = self.image_processor.enhance_image(image_array)
             
-            # Step 4: Extract regions of interest
+            # Step 4: Extract regions of interest and score them once
             roi_list = self.image_processor.extract_roi(enhanced_image)
+            affected_mask = self._roi_affected_mask(roi_list)
             
             # Step 5: Detect disease
             disease_detection = self.disease_detector.detect_disease(
@@ -68,16 +117,17 @@ class PlantAnalyzer:
             severity_analysis = self._analyze_severity(
                 primary_disease,
                 disease_detection['feature_analysis'],
-                roi_list
+                roi_list,
+                affected_mask
             )
             
             # Step 7: Compile results
             analysis_result = {
                 'success': True,
                 'image_info': {
-                    'format': validation['format'],
-                    'size': validation['size'],
-                    'original_size': original_image.size
+                    'format': image_info['format'],
+                    'size': image_info['size'],
+                    'original_size': image_info['original_size']
                 },
                 'disease_detection': {
                     'primary_disease': primary_disease['disease'],
@@ -88,11 +138,12 @@ class PlantAnalyzer:
                 },
                 'predictions': disease_detection['predictions'],
                 'feature_analysis': disease_detection['feature_analysis'],
-                'roi_analysis': self._summarize_roi(roi_list),
+                'roi_analysis': self._summarize_roi(roi_list, affected_mask),
                 'severity_details': severity_analysis,
                 'timestamp': self._get_timestamp()
             }
             
+            self._analysis_cache_put(cache_key, analysis_result)
             return analysis_result
             
         except Exception as e:
@@ -102,7 +153,31 @@ class PlantAnalyzer:
                 'stage': 'analysis'
             }
     
-    def _analyze_severity(self, disease_info: Dict, features: Dict, roi_list: List) -> Dict:
+    def _analysis_cache_get(self, key: Tuple) -> Optional[Dict]:
+        """Return a private copy of a cached analysis, marking it recently used."""
+        with self._cache_lock:
+            result = self.analysis_cache.get(key)
+            if result is None:
+                return None
+            self.analysis_cache.move_to_end(key)
+        return copy.deepcopy(result)
+    
+    def _analysis_cache_put(self, key: Tuple, result: Dict) -> None:
+        """Store a copy of an analysis, evicting the least recently used entry when full."""
+        result = copy.deepcopy(result)
+        with self._cache_lock:
+            self.analysis_cache[key] = result
+            self.analysis_cache.move_to_end(key)
+            if len(self.analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                self.analysis_cache.popitem(last=False)
+    
+    def _analyze_severity(
+        self,
+        disease_info: Dict,
+        features: Dict,
+        roi_list: List,
+        affected_mask: np.ndarray
+    ) -> Dict:
         """
         Analyze disease severity based on multiple factors.
         
@@ -110,6 +185,7 @@ class PlantAnalyzer:
             disease_info: Disease detection information
             features: Extracted image features
             roi_list: List of regions of interest
+            affected_mask: Per-ROI result of _roi_affected_mask
             
         Returns:
             Dictionary with severity analysis
@@ -122,18 +198,15 @@ class PlantAnalyzer:
         edge_density = features.get('edge_density', 0)
         
         # Determine affected area percentage
-        affected_area = len([roi for roi in roi_list if self._is_roi_affected(roi)]) / max(len(roi_list), 1)
+        affected_area = float(affected_mask.mean()) if affected_mask.size else 0.0
         
-        # Calculate final severity level
-        if damage_ratio > 0.6 or affected_area > 0.7:
-            severity_level = 'severe'
-            progression = 'advancing'
-        elif damage_ratio > 0.3 or affected_area > 0.4:
-            severity_level = 'moderate'
-            progression = 'progressing'
-        else:
-            severity_level = 'mild'
-            progression = 'early_stage'
+        # Calculate final severity level from whichever metric is worse
+        tier = max(
+            bisect_left(_SEV_DAMAGE_CUTS, damage_ratio),
+            bisect_left(_SEV_AREA_CUTS, affected_area)
+        )
+        severity_level = _SEV_LABELS[tier]
+        progression = _PROG_LABELS[tier]
         
         return {
             'base_severity': base_severity,
@@ -145,19 +218,31 @@ class PlantAnalyzer:
             'confidence_in_severity': min(0.95, max(damage_ratio, affected_area))
         }
     
-    def _is_roi_affected(self, roi: Dict) -> bool:
-        """Check if region of interest shows signs of disease."""
-        roi_data = roi['data']
+    def _roi_affected_mask(self, roi_list: List[ROI]) -> np.ndarray:
+        """
+        Check which regions of interest show signs of disease.
+        All ROIs share one shape, so they are scored in a single reduction.
+        
+        Args:
+            roi_list: List of regions of interest
+            
+        Returns:
+            Boolean array, True where the ROI is affected
+        """
+        if not roi_list:
+            return np.zeros(0, dtype=bool)
+        
         # Simple heuristic: if ROI has high edge density, likely affected
-        edge_density = np.std(roi_data)
-        return edge_density > 15
+        rois = np.stack([roi.data for roi in roi_list])
+        edge_density = rois.reshape(len(roi_list), -1).std(axis=1)
+        return edge_density > self.ROI_AFFECTED_STD
     
-    def _summarize_roi(self, roi_list: List) -> Dict:
+    def _summarize_roi(self, roi_list: List, affected_mask: np.ndarray) -> Dict:
         """Summarize regions of interest analysis."""
         if not roi_list:
             return {'total_rois': 0, 'affected_rois': 0}
         
-        affected = len([r for r in roi_list if self._is_roi_affected(r)])
+        affected = int(affected_mask.sum())
         
         return {
             'total_rois': len(roi_list),
@@ -168,26 +253,39 @@ class PlantAnalyzer:
     
     def _get_timestamp(self) -> str:
         """Get current timestamp."""
-        from datetime import datetime
-        return datetime.utcnow().isoformat() + 'Z'
+        return f"{datetime.utcnow().isoformat()}Z"
     
-    def batch_analyze(self, image_files: List) -> List[Dict]:
+    def batch_analyze(self, image_files: List, confidence_threshold: float = 0.7) -> List[Dict]:
         """
         Analyze multiple plant images.
+        Images are analyzed concurrently; decoding, OpenCV and NumPy work
+        release the GIL, so independent images use separate cores.
         
         Args:
             image_files: List of image files
+            confidence_threshold: Minimum confidence for predictions
             
         Returns:
-            List of analysis results
+            List of analysis results, in input order
         """
-        results = []
-        for image_file in image_files:
-            result = self.analyze_plant_image(image_file)
-            results.append(result)
+        if len(image_files) <= 1:
+            return [
+                self.analyze_plant_image(image_file, confidence_threshold)
+                for image_file in image_files
+            ]
         
-        return results
-
+        return list(self._get_pool().map(
+            lambda image_file: self.analyze_plant_image(image_file, confidence_threshold),
+            image_files
+        ))
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Create the shared worker pool on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    thread_name_prefix='plant-analyzer'
+                )
+            return self._pool
 
-# Import numpy for severity analysis
-import numpy as np
@@ -1,8 +1,11 @@
 """Helper utilities and common functions."""
 
+import secrets
+import struct
 import uuid
+from bisect import bisect_right
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 
 def generate_session_id() -> str:
@@ -12,7 +15,7 @@ def generate_session_id() -> str:
     Returns:
         Unique session identifier
     """
-    return str(uuid.uuid4())
+    return uuid.uuid4().hex
 
 
 def generate_filename(original_filename: str, prefix: str = '') -> str:
@@ -27,13 +30,11 @@ def generate_filename(original_filename: str, prefix: str = '') -> str:
         Safe filename
     """
     timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-    unique_id = str(uuid.uuid4())[:8]
+    unique_id = secrets.token_hex(4)
     
     # Extract extension
-    if '.' in original_filename:
-        ext = original_filename.rsplit('.', 1)[1].lower()
-    else:
-        ext = 'jpg'
+    _, sep, ext = original_filename.rpartition('.')
+    ext = ext.lower() if sep else 'jpg'
     
     # Create safe filename
     if prefix:
@@ -42,6 +43,9 @@ def generate_filename(original_filename: str, prefix: str = '') -> str:
         return f"{timestamp}_{unique_id}.{ext}"
 
 
+_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+
 def format_response(success: bool, data: Dict = None, error: str = None, 
                    message: str = None, status_code: int = 200) -> tuple:
     """
@@ -59,18 +63,12 @@ def format_response(success: bool, data: Dict = None, error: str = None,
     """
     response = {
         'success': success,
-        'timestamp': datetime.utcnow().isoformat() + 'Z'
+        'timestamp': datetime.utcnow().strftime(_TIMESTAMP_FORMAT),
+        **({'data': data} if data else {}),
+        **({'error': error} if error else {}),
+        **({'message': message} if message else {})
     }
     
-    if data:
-        response['data'] = data
-    
-    if error:
-        response['error'] = error
-    
-    if message:
-        response['message'] = message
-    
     return response, status_code
 
 
@@ -120,30 +118,29 @@ def parse_confidence_scores(predictions: List[Dict]) -> List[Dict]:
     """
     formatted = []
     for pred in predictions:
-        formatted_pred = {
+        confidence = float(pred.get('confidence', 0))
+        formatted.append({
             'disease': pred.get('disease', 'unknown'),
-            'confidence': round(float(pred.get('confidence', 0)) * 100, 1),
-            'confidence_level': _get_confidence_label(pred.get('confidence', 0)),
+            'confidence': round(confidence * 100, 1),
+            'confidence_level': _get_confidence_label(confidence),
             'severity': pred.get('severity', 'unknown'),
             'description': pred.get('description', '')
-        }
-        formatted.append(formatted_pred)
+        })
     
     return formatted
 
 
+# Lower bounds (inclusive) of each confidence label above 'Low'
+_CONFIDENCE_THRESHOLDS = (0.4, 0.6, 0.75, 0.9)
+_CONFIDENCE_LABELS = ('Low', 'Fair', 'Moderate', 'High', 'Very High')
+
+
 def _get_confidence_label(confidence: float) -> str:
     """Get label for confidence score."""
-    if confidence >= 0.9:
-        return 'Very High'
-    elif confidence >= 0.75:
-        return 'High'
-    elif confidence >= 0.6:
-        return 'Moderate'
-    elif confidence >= 0.4:
-        return 'Fair'
-    else:
-        return 'Low'
+    # bisect would rank NaN highest; like the comparisons it replaces, it is 'Low'
+    if not confidence >= _CONFIDENCE_THRESHOLDS[0]:
+        return _CONFIDENCE_LABELS[0]
+    return _CONFIDENCE_LABELS[bisect_right(_CONFIDENCE_THRESHOLDS, confidence)]
 
 
 def merge_dicts(base_dict: Dict, update_dict: Dict, deep: bool = False) -> Dict:
@@ -158,13 +155,16 @@ def merge_dicts(base_dict: Dict, update_dict: Dict, deep: bool = False) -> Dict:
     Returns:
         Merged dictionary
     """
-    result = base_dict.copy()
+    if not deep:
+        return {**base_dict, **update_dict}
+    
+    result = {**base_dict, **update_dict}
     
+    # Recurse only where both sides hold a dict under the same key
     for key, value in update_dict.items():
-        if deep and key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = merge_dicts(result[key], value, deep=True)
-        else:
-            result[key] = value
+        base_value = base_dict.get(key)
+        if isinstance(base_value, dict) and isinstance(value, dict):
+            result[key] = merge_dicts(base_value, value, deep=True)
     
     return result
 
@@ -184,3 +184,65 @@ def calculate_percentage_change(old_value: float, new_value: float) -> float:
         return 0.0
     
     return ((new_value - old_value) / abs(old_value)) * 100
+
+
+# JPEG start-of-frame markers (0xC4, 0xC8 and 0xCC share the range but are not frames)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def parse_image_header(header: bytes) -> Optional[Tuple[str, int, int]]:
+    """
+    Read format and dimensions from the leading bytes of an image file.
+    Supports PNG, GIF, WEBP and JPEG without decoding any pixel data.
+    
+    Args:
+        header: First bytes of the file (64KB covers typical JPEG metadata)
+        
+    Returns:
+        Tuple of (format, width, height), or None if not recognised
+    """
+    try:
+        if header[:8] == b'\x89PNG\r\n\x1a\n' and header[12:16] == b'IHDR':
+            width, height = struct.unpack('>II', header[16:24])
+            return 'PNG', width, height
+        
+        if header[:6] in (b'GIF87a', b'GIF89a'):
+            width, height = struct.unpack('<HH', header[6:10])
+            return 'GIF', width, height
+        
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            chunk = header[12:16]
+            if chunk == b'VP8 ' and header[23:26] == b'\x9d\x01\x2a':
+                width, height = struct.unpack('<HH', header[26:30])
+                return 'WEBP', width & 0x3FFF, height & 0x3FFF
+            if chunk == b'VP8L' and header[20] == 0x2F:
+                bits = int.from_bytes(header[21:25], 'little')
+                return 'WEBP', (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b'VP8X':
+                width = int.from_bytes(header[24:27], 'little') + 1
+                height = int.from_bytes(header[27:30], 'little') + 1
+                return 'WEBP', width, height
+            return None
+        
+        if header[:3] == b'\xff\xd8\xff':
+            offset = 2
+            while offset + 9 <= len(header):
+                if header[offset] != 0xFF:
+                    return None
+                marker = header[offset + 1]
+                if marker == 0xFF:
+                    offset += 1
+                    continue
+                if marker in _JPEG_SOF_MARKERS:
+                    height, width = struct.unpack('>HH', header[offset + 5:offset + 9])
+                    return 'JPEG', width, height
+                if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                    offset += 2
+                    continue
+                segment_length = struct.unpack('>H', header[offset + 2:offset + 4])[0]
+                offset += 2 + segment_length
+        
+        return None
+        
+    except (struct.error, IndexError):
+        return None
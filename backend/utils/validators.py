@@ -1,10 +1,19 @@
 """Input validation utilities."""
 
+import re
+from functools import lru_cache
 from werkzeug.datastructures import FileStorage
 from PIL import Image
 from io import BytesIO
 
 
+_ALLOWED_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif', 'webp'})
+_ALLOWED_FORMATS = frozenset({'JPEG', 'PNG', 'GIF', 'WEBP'})
+_SESSION_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+MAX_UPLOAD_SIZE = 5 << 20  # 5MB
+
+
 def validate_file_upload(file: FileStorage) -> dict:
     """
     Validate uploaded file.
@@ -19,27 +28,29 @@ def validate_file_upload(file: FileStorage) -> dict:
         return {'valid': False, 'error': 'No file selected'}
     
     # Check file extension
-    allowed_extensions = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
     filename = file.filename.lower()
     
-    if '.' not in filename:
-        return {'valid': False, 'error': 'File has no extension'}
+    _, sep, extension = filename.rpartition('.')
     
-    extension = filename.rsplit('.', 1)[1]
+    if not sep:
+        return {'valid': False, 'error': 'File has no extension'}
     
-    if extension not in allowed_extensions:
+    if extension not in _ALLOWED_EXTENSIONS:
         return {
             'valid': False,
-            'error': f'Invalid file type. Allowed: {", ".join(allowed_extensions)}'
+            'error': f'Invalid file type. Allowed: {", ".join(_ALLOWED_EXTENSIONS)}'
         }
     
-    # Check file size (5MB limit)
-    file.seek(0, 2)  # Seek to end
-    file_size = file.tell()
-    file.seek(0)  # Reset
+    # Check file size (5MB limit). A declared Content-Length rejects
+    # oversized parts up front; otherwise measure the spooled stream, since
+    # a small declared length is client-supplied and cannot be trusted.
+    file_size = file.content_length or 0
+    if file_size <= MAX_UPLOAD_SIZE:
+        file.seek(0, 2)  # Seek to end
+        file_size = file.tell()
+        file.seek(0)  # Reset
     
-    max_size = 5 * 1024 * 1024  # 5MB
-    if file_size > max_size:
+    if file_size > MAX_UPLOAD_SIZE:
         return {
             'valid': False,
             'error': f'File too large. Maximum: 5MB, Got: {file_size / 1024 / 1024:.2f}MB'
@@ -83,7 +94,7 @@ def validate_image_file(file: FileStorage) -> dict:
             }
         
         # Check image format
-        if img.format not in ['JPEG', 'PNG', 'GIF', 'WEBP']:
+        if img.format not in _ALLOWED_FORMATS:
             return {
                 'valid': False,
                 'error': f'Unsupported image format: {img.format}'
@@ -115,10 +126,16 @@ def validate_confidence_threshold(threshold: float) -> dict:
     if not isinstance(threshold, (int, float)):
         return {'valid': False, 'error': 'Threshold must be a number'}
     
+    return dict(_validate_confidence_threshold_cached(threshold))
+
+
+@lru_cache(maxsize=256)
+def _validate_confidence_threshold_cached(threshold: float) -> tuple:
+    """Range-check a numeric threshold; returns hashable (key, value) pairs."""
     if threshold < 0.0 or threshold > 1.0:
-        return {'valid': False, 'error': 'Threshold must be between 0.0 and 1.0'}
+        return (('valid', False), ('error', 'Threshold must be between 0.0 and 1.0'))
     
-    return {'valid': True, 'value': float(threshold)}
+    return (('valid', True), ('value', float(threshold)))
 
 
 def validate_session_id(session_id: str) -> dict:
@@ -134,12 +151,17 @@ def validate_session_id(session_id: str) -> dict:
     if not session_id or not isinstance(session_id, str):
         return {'valid': False, 'error': 'Invalid session ID'}
     
+    return dict(_validate_session_id_cached(session_id))
+
+
+@lru_cache(maxsize=1024)
+def _validate_session_id_cached(session_id: str) -> tuple:
+    """Check session ID length and characters; returns hashable (key, value) pairs."""
     if len(session_id) < 8 or len(session_id) > 100:
-        return {'valid': False, 'error': 'Session ID length invalid'}
+        return (('valid', False), ('error', 'Session ID length invalid'))
     
     # Check for valid characters
-    import re
-    if not re.match(r'^[a-zA-Z0-9_-]+$', session_id):
-        return {'valid': False, 'error': 'Session ID contains invalid characters'}
+    if not _SESSION_RE.match(session_id):
+        return (('valid', False), ('error', 'Session ID contains invalid characters'))
     
-    return {'valid': True, 'session_id': session_id}
+    return (('valid', True), ('session_id', session_id))
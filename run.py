@@ -18,6 +18,33 @@ sys.path.insert(0, str(backend_path))
 from app import create_app
 
 
+def serve(app, host: str, port: int):
+    """
+    Serve the app with gunicorn, the production server from requirements.
+    Used when USE_GUNICORN=true; worker and thread counts come from
+    GUNICORN_WORKERS and GUNICORN_THREADS.
+    Falls back to Flask's threaded server where gunicorn is unavailable
+    (it does not run on Windows).
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        app.run(host=host, port=port, threaded=True)
+        return
+    
+    class GunicornApp(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', int(os.getenv('GUNICORN_WORKERS', 2)))
+            self.cfg.set('threads', int(os.getenv('GUNICORN_THREADS', 4)))
+            self.cfg.set('timeout', 120)
+        
+        def load(self):
+            return app
+    
+    GunicornApp().run()
+
+
 if __name__ == '__main__':
     # Create Flask app
     app = create_app(os.getenv('FLASK_ENV', 'development'))
@@ -26,6 +53,7 @@ if __name__ == '__main__':
     host = os.getenv('FLASK_HOST', '0.0.0.0')
     port = int(os.getenv('FLASK_PORT', 5000))
     debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
+    use_gunicorn = os.getenv('USE_GUNICORN', 'False').lower() == 'true'
     
     print(f"""
     ===========================================================
@@ -41,5 +69,9 @@ if __name__ == '__main__':
     ===========================================================
     """)
     
-    # Run Flask app
-    app.run(host=host, port=port, debug=debug)
+    # Run Flask app: dev server unless USE_GUNICORN=true opts into a
+    # multi-worker WSGI server (ignored when debugging)
+    if use_gunicorn and not debug:
+        serve(app, host, port)
+    else:
+        app.run(host=host, port=port, debug=debug)
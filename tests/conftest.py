@@ -0,0 +1,6 @@
+"""Pytest configuration: mirror run.py by putting backend/ on sys.path."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
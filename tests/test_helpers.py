@@ -0,0 +1,90 @@
+"""Unit tests for helper utilities."""
+
+import unittest
+from io import BytesIO
+
+from PIL import Image
+
+from backend.utils.helpers import parse_confidence_scores, parse_image_header
+
+
+def _encode(fmt, size=(300, 200), mode='RGB', **save_kwargs):
+    """Encode a blank image and return its bytes."""
+    buffer = BytesIO()
+    Image.new(mode, size).save(buffer, fmt, **save_kwargs)
+    return buffer.getvalue()
+
+
+class TestParseImageHeader(unittest.TestCase):
+    """Test cases for parse_image_header against PIL."""
+
+    def assertMatchesPil(self, data):
+        """Assert the parsed header agrees with PIL's format and size."""
+        img = Image.open(BytesIO(data))
+        self.assertEqual(parse_image_header(data), (img.format, *img.size))
+
+    def test_formats(self):
+        """Test every supported format and encoder variant."""
+        cases = {
+            'png': _encode('PNG'),
+            'gif': _encode('GIF'),
+            'jpeg': _encode('JPEG'),
+            'jpeg_progressive': _encode('JPEG', progressive=True),
+            'jpeg_large_exif': _encode('JPEG', exif=b'Exif\x00\x00' + b'\x00' * 40000),
+            'webp_vp8': _encode('WEBP'),
+            'webp_vp8l': _encode('WEBP', lossless=True),
+            'webp_vp8x': _encode('WEBP', mode='RGBA')
+        }
+        for name, data in cases.items():
+            with self.subTest(name=name):
+                self.assertMatchesPil(data)
+
+    def test_odd_dimensions(self):
+        """Test dimensions that exercise every byte of the size fields."""
+        for fmt in ('PNG', 'GIF', 'JPEG', 'WEBP'):
+            with self.subTest(fmt=fmt):
+                self.assertMatchesPil(_encode(fmt, size=(4093, 257)))
+
+    def test_truncated_input(self):
+        """Test headers cut before the size fields are not recognised."""
+        cases = {
+            'png': _encode('PNG')[:20],
+            'gif': _encode('GIF')[:8],
+            'webp': _encode('WEBP')[:24],
+            'jpeg': _encode('JPEG', exif=b'Exif\x00\x00' + b'\x00' * 1000)[:500]
+        }
+        for name, data in cases.items():
+            with self.subTest(name=name):
+                self.assertIsNone(parse_image_header(data))
+
+    def test_non_image(self):
+        """Test non-image content is not recognised."""
+        self.assertIsNone(parse_image_header(b''))
+        self.assertIsNone(parse_image_header(b'%PDF-1.4\n' + b'\x00' * 64))
+        self.assertIsNone(parse_image_header(_encode('BMP')))
+
+    def test_jpeg_sof_past_sniff_window(self):
+        """Test a SOF marker beyond the first 64KB needs the full file."""
+        data = _encode('JPEG', exif=b'Exif\x00\x00' + b'\x00' * 65000,
+                       icc_profile=b'\x00' * 5000)
+        self.assertIsNone(parse_image_header(data[:64 * 1024]))
+        self.assertMatchesPil(data)
+
+
+class TestParseConfidenceScores(unittest.TestCase):
+    """Test cases for confidence labels."""
+
+    def test_confidence_labels(self):
+        """Test each label boundary is inclusive and NaN maps to 'Low'."""
+        expected = {
+            0.0: 'Low', 0.39: 'Low', 0.4: 'Fair', 0.59: 'Fair', 0.6: 'Moderate',
+            0.74: 'Moderate', 0.75: 'High', 0.89: 'High', 0.9: 'Very High',
+            1.0: 'Very High', float('nan'): 'Low'
+        }
+        predictions = [{'disease': 'leaf_spot', 'confidence': c} for c in expected]
+        labels = [p['confidence_level'] for p in parse_confidence_scores(predictions)]
+        self.assertEqual(labels, list(expected.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+"""Unit tests for image processor."""
+
+import base64
+import os
+import re
+import tempfile
+import unittest
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from services.image_processor import ImageProcessor
+
+
+def _strip_address(error):
+    """Drop object addresses; PIL names the in-memory buffer it was given."""
+    return re.sub(r' at 0x[0-9a-f]+', '', str(error))
+
+
+def _jpeg_with_resized_sof(width, height):
+    """
+    Build a 300x300 JPEG whose SOF sits behind 8KB of EXIF, plus a copy
+    with the SOF dimensions rewritten. Only bytes in the middle differ.
+    """
+    buffer = BytesIO()
+    Image.effect_noise((300, 300), 80).convert('RGB').save(
+        buffer, 'JPEG', exif=b'Exif\x00\x00' + bytes(8000)
+    )
+    original = buffer.getvalue()
+    sof = original.index(b'\xff\xc0')
+    rewritten = bytearray(original)
+    rewritten[sof + 5:sof + 9] = height.to_bytes(2, 'big') + width.to_bytes(2, 'big')
+    return original, bytes(rewritten)
+
+
+class TestImageProcessor(unittest.TestCase):
+    """Test cases for ImageProcessor."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        buffer = BytesIO()
+        pixels = np.random.default_rng(0).integers(0, 256, (300, 300, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(buffer, 'PNG')
+        self.png = buffer.getvalue()
+
+    def _upload(self, data, content_type='image/png'):
+        """Wrap bytes in an upload."""
+        return FileStorage(BytesIO(data), content_type=content_type)
+
+    def test_paranoid_validation_verifies_cached_content(self):
+        """Test mid-file damage is caught even when the header is cached."""
+        processor = ImageProcessor(paranoid_validation=True)
+        self.assertTrue(processor.validate_image_format(self._upload(self.png))[0])
+
+        damaged = bytearray(self.png)
+        middle = len(damaged) // 2
+        damaged[middle:middle + 50] = bytes(50)
+        is_valid, message = processor.validate_image_format(self._upload(bytes(damaged)))
+        self.assertFalse(is_valid)
+        self.assertIn('Invalid image file', message)
+
+    def test_metadata_cache_keys_on_full_content(self):
+        """Test a cached header is not reused for a file differing mid-stream."""
+        original, oversized = _jpeg_with_resized_sof(6000, 6000)
+        processor = ImageProcessor()
+        self.assertTrue(processor.validate_image(self._upload(original, 'image/jpeg'))['valid'])
+
+        result = processor.validate_image(self._upload(oversized, 'image/jpeg'))
+        self.assertFalse(result['valid'])
+        self.assertIn('too large', result['error'])
+
+
+    def test_process_outputs(self):
+        """Test process returns the target tensor, info and raw bytes."""
+        result = ImageProcessor().process(self._upload(self.png))
+        self.assertTrue(result['valid'])
+        self.assertEqual(result['tensor'].shape, (224, 224, 3))
+        self.assertEqual(result['tensor'].dtype, np.float32)
+        self.assertEqual(result['info']['format'], 'PNG')
+        self.assertEqual(result['info']['original_size'], (300, 300))
+        self.assertEqual(base64.b64decode(result['b64']), self.png)
+
+    def test_process_metadata_cache(self):
+        """Test repeat content hits the cache and new content misses it."""
+        processor = ImageProcessor()
+        first = processor.process(self._upload(self.png), include_base64=False)
+        second = processor.process(self._upload(self.png), include_base64=False)
+        self.assertEqual(len(processor._meta_cache), 1)
+        np.testing.assert_array_equal(first['tensor'], second['tensor'])
+
+        original, oversized = _jpeg_with_resized_sof(6000, 6000)
+        self.assertTrue(processor.process(self._upload(original, 'image/jpeg'))['valid'])
+        self.assertEqual(len(processor._meta_cache), 2)
+
+        result = processor.process(self._upload(oversized, 'image/jpeg'))
+        self.assertFalse(result['valid'])
+        self.assertIn('too large', result['error'])
+
+    def test_process_rejects_invalid_uploads(self):
+        """Test MIME, empty and non-image uploads are rejected."""
+        processor = ImageProcessor()
+        cases = {
+            'Unsupported MIME type': self._upload(self.png, 'text/plain'),
+            'File is empty': self._upload(b''),
+            'Image processing failed': self._upload(b'not an image' * 10)
+        }
+        for error, upload in cases.items():
+            with self.subTest(error=error):
+                result = processor.process(upload)
+                self.assertFalse(result['valid'])
+                self.assertIn(error, result['error'])
+
+    def test_process_gif_fallback(self):
+        """Test formats OpenCV cannot decode go through PIL."""
+        images = {}
+        for fmt in ('GIF', 'PNG'):
+            buffer = BytesIO()
+            Image.new('RGB', (300, 200), (10, 200, 30)).save(buffer, fmt)
+            images[fmt] = buffer.getvalue()
+        gif = ImageProcessor().process(self._upload(images['GIF'], 'image/gif'))
+        png = ImageProcessor().process(self._upload(images['PNG']))
+        self.assertTrue(gif['valid'])
+        self.assertEqual(gif['info']['original_size'], (300, 200))
+        np.testing.assert_array_equal(gif['tensor'], png['tensor'])
+
+    def test_process_path_input(self):
+        """Test file paths (read via mmap) match uploads."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'leaf.png')
+            empty_path = os.path.join(directory, 'empty.png')
+            with open(path, 'wb') as f:
+                f.write(self.png)
+            open(empty_path, 'wb').close()
+
+            processor = ImageProcessor()
+            from_path = processor.process(path)
+            from_upload = processor.process(self._upload(self.png))
+            self.assertTrue(from_path['valid'])
+            self.assertEqual(from_path['b64'], from_upload['b64'])
+            np.testing.assert_array_equal(from_path['tensor'], from_upload['tensor'])
+            self.assertEqual(processor.process(empty_path)['error'], 'File is empty')
+
+
+    def test_enhance_image_output_layout(self):
+        """Test enhancement returns a fresh C-contiguous 0-1 float32 array."""
+        tensor = ImageProcessor().process(self._upload(self.png))['tensor']
+        enhanced = ImageProcessor().enhance_image(tensor)
+        self.assertIsNot(enhanced, tensor)
+        self.assertTrue(enhanced.flags['C_CONTIGUOUS'])
+        self.assertEqual(enhanced.dtype, np.float32)
+        self.assertEqual(enhanced.shape, tensor.shape)
+        self.assertTrue(0.0 <= enhanced.min() and enhanced.max() <= 1.0)
+
+
+    def test_process_batch_matches_single(self):
+        """Test batch preprocessing matches per-image results in order."""
+        pngs = [self.png]
+        for color in ((10, 200, 30), (200, 30, 10)):
+            buffer = BytesIO()
+            Image.new('RGB', (300, 200), color).save(buffer, 'PNG')
+            pngs.append(buffer.getvalue())
+        processor = ImageProcessor()
+        batch = processor.process_batch([self._upload(data) for data in pngs])
+        expected = [processor.preprocess_image(self._upload(data)) for data in pngs]
+
+        self.assertEqual(len(batch), len(expected))
+        for (array, original), (expected_array, expected_original) in zip(batch, expected):
+            np.testing.assert_array_equal(array, expected_array)
+            np.testing.assert_array_equal(original, expected_original)
+
+    def test_process_batch_failing_item(self):
+        """Test a failing image raises the same error as preprocessing it alone."""
+        processor = ImageProcessor()
+        uploads = [self._upload(self.png), self._upload(b'not an image' * 10)]
+        with self.assertRaises(Exception) as single:
+            processor.preprocess_image(uploads[1])
+        with self.assertRaises(Exception) as batch:
+            processor.process_batch(uploads)
+        self.assertEqual(_strip_address(batch.exception), _strip_address(single.exception))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+"""Unit tests for the logic engine."""
+
+import unittest
+
+from services.logic_engine import LogicEngine
+
+
+class TestLogicEngine(unittest.TestCase):
+    """Test cases for LogicEngine."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.engine = LogicEngine()
+
+    def test_cache_honours_threshold_changes(self):
+        """Test changing low_confidence_threshold is not masked by the cache."""
+        analysis = {'diagnosis': 'Leaf spot', 'confidence': 60.0, 'health_score': 70.0}
+        conditions = self.engine.process_analysis(analysis)['conditions']
+        self.assertNotIn('LOW_CONFIDENCE_DIAGNOSIS', conditions)
+
+        self.engine.low_confidence_threshold = 70.0
+        conditions = self.engine.process_analysis(analysis)['conditions']
+        self.assertIn('LOW_CONFIDENCE_DIAGNOSIS', conditions)
+
+    def test_cache_is_per_instance(self):
+        """Test engines keep separate caches rather than one class-wide cache."""
+        other = LogicEngine()
+        self.engine.process_analysis({'diagnosis': 'Leaf spot', 'confidence': 85.0})
+        self.assertEqual(self.engine._analysis_cache.cache_info().currsize, 1)
+        self.assertEqual(other._analysis_cache.cache_info().currsize, 0)
+
+    def _process(self, **overrides):
+        """Process a fungal leaf-spot analysis with the given fields overridden."""
+        analysis = {'diagnosis': 'Leaf spot', 'confidence': 85.0, 'health_score': 70.0,
+                    'severity': 'unknown', 'raw_analysis': ''}
+        analysis.update(overrides)
+        return self.engine.process_analysis(analysis)
+
+    def test_followup_tier_edges(self):
+        """Test follow-up tiers include their upper health boundary."""
+        expected = {0: 'DAILY', 20: 'DAILY', 20.5: 'EVERY_2_3_DAYS', 40: 'EVERY_2_3_DAYS',
+                    40.5: 'WEEKLY', 60: 'WEEKLY', 60.5: 'BI_WEEKLY', 80: 'BI_WEEKLY',
+                    100: 'BI_WEEKLY'}
+        for health, schedule in expected.items():
+            with self.subTest(health=health):
+                result = self._process(health_score=health)
+                self.assertEqual(result['follow_up']['schedule'], schedule)
+
+    def test_health_condition_edges(self):
+        """Test health conditions at the 20/40/60/80 thresholds."""
+        critical = ['CRITICAL_PLANT_HEALTH', 'POOR_PLANT_HEALTH', 'FAIR_PLANT_HEALTH']
+        poor = ['POOR_PLANT_HEALTH', 'FAIR_PLANT_HEALTH']
+        fair = ['FAIR_PLANT_HEALTH']
+        good = ['GOOD_PLANT_HEALTH', 'PLANT_APPEARS_HEALTHY']
+        expected = {19.9: critical, 20: critical, 20.1: poor, 39.9: poor, 40: poor,
+                    40.1: fair, 59.9: fair, 60: fair, 60.1: [], 79.9: [], 80: good}
+        for health, conditions in expected.items():
+            with self.subTest(health=health):
+                result = self._process(health_score=health)
+                self.assertEqual(
+                    [c for c in result['conditions'] if 'HEALTH' in c], conditions
+                )
+
+    def test_confidence_condition_edges(self):
+        """Test confidence conditions at the 50/80 thresholds."""
+        expected = {
+            49.9: ['LOW_CONFIDENCE_DIAGNOSIS', 'AMBIGUOUS_DIAGNOSIS', 'FUNGAL_DISEASE_DETECTED'],
+            50: ['FUNGAL_DISEASE_DETECTED'],
+            79.9: ['FUNGAL_DISEASE_DETECTED'],
+            80: ['HIGH_CONFIDENCE_DIAGNOSIS', 'FUNGAL_DISEASE_DETECTED']
+        }
+        for confidence, conditions in expected.items():
+            with self.subTest(confidence=confidence):
+                result = self._process(confidence=confidence)
+                self.assertEqual(result['conditions'], conditions)
+
+    def test_severity_strings(self):
+        """Test severity strings are case-insensitive and set treatment priority."""
+        expected = {
+            'severe': ('SEVERE_DISEASE', 'URGENT'),
+            'SEVERE': ('SEVERE_DISEASE', 'URGENT'),
+            'Moderate': ('MODERATE_DISEASE', 'HIGH'),
+            'mild': ('MILD_DISEASE', 'MEDIUM'),
+            'unknown': (None, 'MEDIUM'),
+            'none': (None, 'MEDIUM')
+        }
+        for severity, (condition, priority) in expected.items():
+            with self.subTest(severity=severity):
+                result = self._process(diagnosis='Powdery Mildew', severity=severity)
+                severity_conditions = [c for c in result['conditions'] if c.endswith('_DISEASE')]
+                self.assertEqual(severity_conditions, [condition] if condition else [])
+                self.assertEqual(
+                    [(s['type'], s['priority']) for s in result['suggestions']],
+                    [('FUNGAL_DISEASE_TREATMENT', priority)]
+                )
+
+    def test_risk_assessment(self):
+        """Test risk scores and levels across categories and severities."""
+        cases = [
+            ('Powdery Mildew', 30, 'severe', 75, 'CRITICAL'),
+            ('Bacterial Leaf Spot', 50, 'moderate', 35, 'MEDIUM'),
+            ('mosaic virus', 70, 'mild', 25, 'MEDIUM'),
+            ('Leaf spot', 85, 'unknown', 20, 'LOW'),
+            ('Fire Blight', 10, 'severe', 90, 'CRITICAL'),
+            ('healthy', 95, 'none', 5, 'LOW')
+        ]
+        for diagnosis, health, severity, score, level in cases:
+            with self.subTest(diagnosis=diagnosis):
+                risk = self._process(
+                    diagnosis=diagnosis, health_score=health, severity=severity
+                )['risk_assessment']
+                self.assertEqual((risk['risk_score'], risk['risk_level']), (score, level))
+
+    def test_pest_keywords(self):
+        """Test pest keywords route to pest management."""
+        for diagnosis in ('pest damage', 'insect bites'):
+            with self.subTest(diagnosis=diagnosis):
+                result = self._process(diagnosis=diagnosis)
+                self.assertEqual(result['conditions'], ['HIGH_CONFIDENCE_DIAGNOSIS'])
+                self.assertEqual(result['disease_category'], 'PEST_DAMAGE')
+                self.assertEqual([s['type'] for s in result['suggestions']], ['PEST_MANAGEMENT'])
+
+    def test_healthy_keywords(self):
+        """Test healthy diagnoses, including the cases that miss the fast path."""
+        cases = [
+            ('healthy', 85, 90, ['HIGH_CONFIDENCE_DIAGNOSIS', 'GOOD_PLANT_HEALTH',
+                                 'PLANT_APPEARS_HEALTHY'], ['PREVENTATIVE_CARE']),
+            ('no disease detected', 85, 90, ['HIGH_CONFIDENCE_DIAGNOSIS', 'GOOD_PLANT_HEALTH',
+                                             'PLANT_APPEARS_HEALTHY'], ['PREVENTATIVE_CARE']),
+            ('healthy', 40, 90, ['LOW_CONFIDENCE_DIAGNOSIS', 'AMBIGUOUS_DIAGNOSIS',
+                                 'GOOD_PLANT_HEALTH'],
+             ['DIAGNOSIS_CLARIFICATION', 'PREVENTATIVE_CARE']),
+            ('healthy', 85, 60, ['HIGH_CONFIDENCE_DIAGNOSIS', 'FAIR_PLANT_HEALTH'],
+             ['PREVENTATIVE_CARE'])
+        ]
+        for diagnosis, confidence, health, conditions, suggestions in cases:
+            with self.subTest(diagnosis=diagnosis, confidence=confidence, health=health):
+                result = self._process(
+                    diagnosis=diagnosis, confidence=confidence, health_score=health
+                )
+                self.assertEqual(result['conditions'], conditions)
+                self.assertEqual(result['disease_category'], 'HEALTHY')
+                self.assertEqual([s['type'] for s in result['suggestions']], suggestions)
+                self.assertEqual(result['urgent_actions'], [])
+                self.assertEqual(result['risk_assessment']['risk_score'], 5)
+
+    def test_batch_matches_single(self):
+        """Test process_analyses agrees with process_analysis item by item."""
+        analyses = [
+            {'diagnosis': diagnosis, 'confidence': confidence, 'health_score': health,
+             'severity': severity, 'raw_analysis': raw}
+            for diagnosis, raw in (('Powdery Mildew', ''), ('healthy', ''),
+                                   ('pest damage', ''), ('Leaf spot', 'leaves look dry'),
+                                   ('Nitrogen deficiency', 'nutrient issue'))
+            for confidence in (49.9, 50, 80)
+            for health in (20, 20.5, 40, 60, 80, float('nan'))
+            for severity in ('severe', 'mild', 'unknown')
+        ] + [{}, {'diagnosis': 'rust'}]
+        self.assertEqual(
+            self.engine.process_analyses(analyses),
+            [self.engine.process_analysis(analysis) for analysis in analyses]
+        )
+
+    def test_nan_health_score_followup(self):
+        """Test a NaN health score falls through to the good-health plan."""
+        analysis = {'diagnosis': 'Leaf spot', 'confidence': 85.0,
+                    'health_score': float('nan'), 'severity': 'mild'}
+        expected = self.engine._determine_followup(85.0, 90.0)
+        self.assertEqual(self.engine.process_analysis(analysis)['follow_up'], expected)
+        self.assertEqual(self.engine.process_analyses([analysis])[0]['follow_up'], expected)
+
+    def test_cached_result_preserves_input_types(self):
+        """Test int and float inputs do not share a cache entry."""
+        for confidence in (80, 80.0, 80):
+            result = self.engine.process_analysis(
+                {'diagnosis': 'Leaf spot', 'confidence': confidence, 'health_score': 55}
+            )
+            self.assertIs(type(result['confidence']), type(confidence))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Unit tests for plant analyzer."""
+
+import copy
+import re
+import unittest
+from io import BytesIO
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from services.plant_analyzer import PlantAnalyzer
+
+
+def _strip_address(error):
+    """Drop object addresses; PIL names the in-memory buffer it was given."""
+    return re.sub(r' at 0x[0-9a-f]+', '', str(error))
+
+
+def _leaf_image(seed, fmt='JPEG'):
+    """Encode a random 300x300 image."""
+    buffer = BytesIO()
+    pixels = np.random.default_rng(seed).integers(0, 256, (300, 300, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def _upload(data, content_type='image/jpeg'):
+    """Wrap bytes in an upload."""
+    return FileStorage(BytesIO(data), filename='leaf.jpg', content_type=content_type)
+
+
+class TestPlantAnalyzer(unittest.TestCase):
+    """Test cases for PlantAnalyzer."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.analyzer = PlantAnalyzer()
+        self.image = _leaf_image(0)
+
+    def _without_timestamp(self, result):
+        """Drop the per-call timestamp so results can be compared."""
+        return {k: v for k, v in result.items() if k != 'timestamp'}
+
+    def test_analysis_cache_hit(self):
+        """Test repeat images reuse the cached analysis."""
+        detector = self.analyzer.disease_detector
+        with mock.patch.object(detector, 'detect_disease', wraps=detector.detect_disease) as detect:
+            first = self.analyzer.analyze_plant_image(_upload(self.image))
+            second = self.analyzer.analyze_plant_image(_upload(self.image))
+        self.assertTrue(first['success'])
+        self.assertEqual(detect.call_count, 1)
+        self.assertEqual(self._without_timestamp(first), self._without_timestamp(second))
+
+    def test_upload_read_once(self):
+        """Test a new image is read once for both validation and the cache key."""
+        processor = self.analyzer.image_processor
+        with mock.patch.object(processor, '_read_bytes', wraps=processor._read_bytes) as read:
+            result = self.analyzer.analyze_plant_image(_upload(self.image))
+        self.assertTrue(result['success'])
+        self.assertEqual(read.call_count, 1)
+
+    def test_analysis_cache_keys_on_threshold(self):
+        """Test a different confidence threshold is analyzed separately."""
+        detector = self.analyzer.disease_detector
+        with mock.patch.object(detector, 'detect_disease', wraps=detector.detect_disease) as detect:
+            self.analyzer.analyze_plant_image(_upload(self.image), confidence_threshold=0.7)
+            self.analyzer.analyze_plant_image(_upload(self.image), confidence_threshold=0.5)
+        self.assertEqual(detect.call_count, 2)
+        self.assertEqual(len(self.analyzer.analysis_cache), 2)
+
+    def test_analysis_cache_returns_private_copies(self):
+        """Test mutating a returned result does not affect later hits."""
+        first = self.analyzer.analyze_plant_image(_upload(self.image))
+        expected = copy.deepcopy(self._without_timestamp(first))
+        first['predictions'].clear()
+        first['disease_detection']['primary_disease'] = 'mutated'
+
+        second = self.analyzer.analyze_plant_image(_upload(self.image))
+        self.assertEqual(self._without_timestamp(second), expected)
+        second['image_info']['size'] = None
+        third = self.analyzer.analyze_plant_image(_upload(self.image))
+        self.assertEqual(self._without_timestamp(third), expected)
+
+    def test_cache_hit_still_validates(self):
+        """Test a cached image is still rejected with an unsupported MIME type."""
+        self.assertTrue(self.analyzer.analyze_plant_image(_upload(self.image))['success'])
+        result = self.analyzer.analyze_plant_image(_upload(self.image, 'text/plain'))
+        self.assertFalse(result['success'])
+        self.assertEqual(result['stage'], 'validation')
+
+    def test_batch_matches_single(self):
+        """Test batch results match per-image results in order, failures included."""
+        images = [
+            (self.image, 'image/jpeg'),
+            (b'not an image' * 10, 'image/jpeg'),
+            (_leaf_image(1, 'PNG'), 'image/png'),
+            (_leaf_image(2), 'image/jpeg')
+        ]
+        uploads = [_upload(*image) for image in images]
+        batch = PlantAnalyzer().batch_analyze(uploads)
+        single = PlantAnalyzer()
+        expected = [single.analyze_plant_image(upload) for upload in uploads]
+
+        self.assertEqual([r['success'] for r in batch], [True, False, True, True])
+        for result in batch + expected:
+            if 'error' in result:
+                result['error'] = _strip_address(result['error'])
+        self.assertEqual(
+            [self._without_timestamp(r) for r in batch],
+            [self._without_timestamp(r) for r in expected]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,28 @@
 """Unit tests for validators."""
 
+import struct
 import unittest
+import zlib
+from io import BytesIO
+
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
 from backend.utils.validators import (
     validate_confidence_threshold,
+    validate_image_file,
     validate_session_id
 )
 
 
+def _image_upload(img, fmt, **save_kwargs):
+    """Build an in-memory upload from a PIL image."""
+    buffer = BytesIO()
+    img.save(buffer, fmt, **save_kwargs)
+    buffer.seek(0)
+    return FileStorage(buffer)
+
+
 class TestValidators(unittest.TestCase):
     """Test cases for validation utilities."""
 
@@ -31,6 +47,32 @@ class TestValidators(unittest.TestCase):
         result = validate_session_id('invalid@session!')
         self.assertFalse(result['valid'])
 
+    def test_valid_image_file(self):
+        """Test a well-formed image passes with its format and size."""
+        result = validate_image_file(_image_upload(Image.new('RGB', (300, 200)), 'PNG'))
+        self.assertEqual(result, {'valid': True, 'format': 'PNG', 'size': (300, 200)})
+
+    def test_image_file_too_small(self):
+        """Test undersized images are rejected."""
+        result = validate_image_file(_image_upload(Image.new('RGB', (50, 60)), 'JPEG'))
+        self.assertFalse(result['valid'])
+        self.assertIn('too small', result['error'])
+
+    def test_fake_png_header_rejected(self):
+        """Test a valid PNG header followed by junk is not accepted."""
+        ihdr = struct.pack('>IIBBBBB', 256, 256, 8, 2, 0, 0, 0)
+        data = (b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + ihdr
+                + struct.pack('>I', zlib.crc32(b'IHDR' + ihdr)) + b'\x00' * 21)
+        result = validate_image_file(FileStorage(BytesIO(data)))
+        self.assertFalse(result['valid'])
+
+    def test_mpo_rejected(self):
+        """Test multi-picture JPEGs are reported as MPO and rejected."""
+        upload = _image_upload(Image.new('RGB', (300, 200)), 'MPO', save_all=True,
+                               append_images=[Image.new('RGB', (300, 200))])
+        result = validate_image_file(upload)
+        self.assertEqual(result['error'], 'Unsupported image format: MPO')
+
 
 if __name__ == '__main__':
     unittest.main()